@@ -3,7 +3,7 @@ from PIL import Image
 from utils import get_status_color, format_currency, format_percentage, get_ticker_snapshot
 from engine import engine
 from dashboard_components import DashboardComponents
-from automated_trader import automated_trader
+from automated_trader import get_automated_trader
 from db import db_manager
 from streamlit_autorefresh import st_autorefresh
 
@@ -32,6 +32,7 @@ def init_components():
     return engine, DashboardComponents()
 
 trading_engine, dashboard = init_components()
+automated_trader = get_automated_trader()
 
 # Try load ticker data for dashboard ticker bar
 try:
@@ -1,33 +1,76 @@
-import json
-import time
+import functools
+import multiprocessing
+import queue
 import threading
+import time
+import orjson
 import logging
-from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import numpy as np
+from datetime import datetime, date, timedelta
 from engine import TradingEngine
-from utils import calculate_drawdown
+from utils import calculate_drawdown, read_capital
+
+# Log records are handed to a queue and written by a listener thread, so the
+# automation loop never blocks on file/console I/O.
+_log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+_log_queue = None
+_log_listener = None
+
+
+def _install_queue_logging():
+    """(Re)build the whole logging pipeline: queue, QueueHandler on the
+    root logger, and the file/console listener thread.
+
+    Runs at trader construction and again inside a forked child. After
+    fork() the listener thread is gone AND the old queue's condition
+    variable still lists the parent's dead listener as a waiter, so a put
+    notifies nobody and records vanish — both the queue and the handler
+    bound to it must be fresh."""
+    global _log_queue, _log_listener
+    _log_queue = queue.Queue(-1)
+    file_handler = RotatingFileHandler(
+        "automated_trader.log", maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(_log_formatter)
+    _log_listener = QueueListener(_log_queue, file_handler, stream_handler)
+    _log_listener.start()
+
+    queue_handler = QueueHandler(_log_queue)
+    # Plain passthrough so the listener's handlers do the real formatting
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    # force=True: engine's import-time basicConfig already installed a
+    # handler, which would otherwise make this call a silent no-op
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler], force=True)
 
 
 class AutomatedTrader:
+    # Persist AUTOMATION_STATS at most once per minute / every 10 cycles
+    STATS_FLUSH_SECS = 60
+    STATS_FLUSH_CYCLES = 10
+    # Rolling window for the drawdown check — matches the baseline's
+    # last-1000-trades view without shipping the whole table every cycle
+    RISK_WINDOW_TRADES = 1000
+
     def __init__(self):
         self.engine = TradingEngine()
         self.db = self.engine.db
         self.client = self.engine.client
         self.is_running = False
-        self.automation_thread = None
+        self.automation_process = None
+        # multiprocessing.Event so stop() works across the process boundary
+        self._stop_event = multiprocessing.Event()
 
-        # === Automation Settings from DB ===
-        self.signal_interval = int(self.db.get_setting("SCAN_INTERVAL") or 3600)
-        self.max_signals = int(self.db.get_setting("TOP_N_SIGNALS") or 5)
-        self.max_drawdown_limit = float(self.db.get_setting("MAX_DRAWDOWN") or 20)
-        self.max_daily_trades = int(self.db.get_setting("MAX_DAILY_TRADES") or 50)
-        self.max_position_pct = float(self.db.get_setting("MAX_POSITION_PCT") or 5)
+        # === Automation Settings + stats from DB (one query) ===
+        stats_setting = self._load_automation_settings(include_stats=True)
 
         # === State ===
         self.last_run_time = None
 
         # Load existing stats or start fresh
-        stats_setting = self.db.get_setting("AUTOMATION_STATS")
-        self.stats = json.loads(stats_setting) if stats_setting else {
+        self.stats = orjson.loads(stats_setting) if stats_setting else {
             "signals_generated": 0,
             "last_update": None,
             "trades_executed": 0,
@@ -35,47 +78,67 @@ class AutomatedTrader:
             "failed_trades": 0,
             "total_pnl": 0.0,
         }
+        # Written by the automation cycle, read by get_status on other threads
+        self._stats_lock = threading.Lock()
+        self._stats_dirty = False
+        self._last_stats_flush = time.monotonic()
+        self._cycles_since_flush = 0
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.FileHandler("automated_trader.log", encoding="utf-8"),
-                logging.StreamHandler()
-            ]
-        )
+        _install_queue_logging()
         self.logger = logging.getLogger(__name__)
 
+    def _load_automation_settings(self, include_stats: bool = False):
+        """Load all automation settings in one batched query. With
+        include_stats, AUTOMATION_STATS rides along in the same round-trip
+        and its raw value is returned for the caller to parse."""
+        keys = [
+            "SCAN_INTERVAL", "TOP_N_SIGNALS", "MAX_DRAWDOWN",
+            "MAX_DAILY_TRADES", "MAX_POSITION_PCT",
+        ]
+        if include_stats:
+            keys.append("AUTOMATION_STATS")
+        settings = self.db.get_settings(keys)
+        self.signal_interval = int(settings.get("SCAN_INTERVAL") or 3600)
+        self.max_signals = int(settings.get("TOP_N_SIGNALS") or 5)
+        self.max_drawdown_limit = float(settings.get("MAX_DRAWDOWN") or 20)
+        self.max_daily_trades = int(settings.get("MAX_DAILY_TRADES") or 50)
+        self.max_position_pct = float(settings.get("MAX_POSITION_PCT") or 5)
+        return settings.get("AUTOMATION_STATS")
+
+    @staticmethod
+    def _start_of_today():
+        today = date.today()
+        return datetime(today.year, today.month, today.day)
+
     def get_today_trades(self):
-        all_trades = self.db.get_trades(limit=500)
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        return [t for t in all_trades if t.timestamp.strftime("%Y-%m-%d") == today_str]
+        return self.db.get_trades_since(self._start_of_today())
 
     def check_risk_limits(self):
-        trades = self.db.get_trades(limit=1000)
+        # Sorted and bounded by the DB — the most recent RISK_WINDOW_TRADES
+        # rows ascending, not the whole table
+        sorted_trades = self.db.get_trades_since(limit=self.RISK_WINDOW_TRADES)
 
-        # Load capital
+        # Load capital (mtime-cached, so this is cheap every cycle)
         try:
-            with open("capital.json", "r") as f:
-                capital_data = json.load(f)
-                capital = capital_data.get("capital", 100)
+            capital = read_capital().get("capital", 100)
         except Exception as e:
             self.logger.error(f"Failed to read capital.json: {e}")
             capital = 100
 
-        equity_curve = [float(capital)]
-        sorted_trades = sorted(trades, key=lambda t: t.timestamp)
-
-        for trade in sorted_trades:
-            pnl = getattr(trade, "pnl", 0.0)
-            equity_curve.append(equity_curve[-1] + float(pnl))
+        # Vectorized equity curve: one cumsum pass instead of a Python loop
+        pnls = np.fromiter(
+            (float(getattr(t, "pnl", 0) or 0) for t in sorted_trades),
+            dtype=np.float64,
+            count=len(sorted_trades),
+        )
+        equity_curve = np.concatenate(([float(capital)], float(capital) + pnls.cumsum()))
 
         max_drawdown, _ = calculate_drawdown(equity_curve)
         if max_drawdown >= self.max_drawdown_limit:
             self.logger.warning(f"🚫 Max drawdown exceeded: {max_drawdown:.2f}%")
             return False
 
-        if len(self.get_today_trades()) >= self.max_daily_trades:
+        if self.db.count_trades_since(self._start_of_today()) >= self.max_daily_trades:
             self.logger.warning("🚫 Max daily trades exceeded")
             return False
 
@@ -92,74 +155,144 @@ class AutomatedTrader:
 
             # Avoid recounting already processed trades
             if not hasattr(trade, "_logged"):
-                self.stats["trades_executed"] += 1
-                self.stats["total_pnl"] += pnl
-                if pnl > 0:
-                    self.stats["successful_trades"] += 1
-                    outcome = "✅ PROFIT"
-                else:
-                    self.stats["failed_trades"] += 1
-                    outcome = "❌ LOSS"
+                with self._stats_lock:
+                    self.stats["trades_executed"] += 1
+                    self.stats["total_pnl"] += pnl
+                    if pnl > 0:
+                        self.stats["successful_trades"] += 1
+                        outcome = "✅ PROFIT"
+                    else:
+                        self.stats["failed_trades"] += 1
+                        outcome = "❌ LOSS"
 
                 self.logger.info(
                     f"[TRADE] {symbol} {side} | Entry: {entry:.4f} | Exit: {exit_price:.4f} | PnL: {pnl:.2f} | {outcome}"
                 )
                 setattr(trade, "_logged", True)
 
+    def _maybe_flush_stats(self, force: bool = False):
+        """Write stats to the DB only when forced, overdue, or after enough
+        cycles — coalescing a round-trip per cycle into one per minute."""
+        if not self._stats_dirty:
+            return
+        due = (
+            force
+            or self._cycles_since_flush >= self.STATS_FLUSH_CYCLES
+            or time.monotonic() - self._last_stats_flush > self.STATS_FLUSH_SECS
+        )
+        if not due:
+            return
+        with self._stats_lock:
+            snapshot = dict(self.stats)
+        self.db.update_automation_stats(snapshot)
+        self._stats_dirty = False
+        self._cycles_since_flush = 0
+        self._last_stats_flush = time.monotonic()
+
     def automation_cycle(self):
-        while self.is_running:
+        while self.is_running and not self._stop_event.is_set():
             try:
+                # The cycle runs in a child process, so parent-side
+                # update_settings() can only reach it through the DB —
+                # re-read the settings row on every wake (one batched query)
+                self._load_automation_settings()
                 now = datetime.now()
                 if not self.last_run_time or (now - self.last_run_time).total_seconds() >= self.signal_interval:
                     self.logger.info("⚙️ Starting automation cycle...")
 
                     if not self.check_risk_limits():
                         self.logger.info("⛔ Risk limits triggered. Sleeping 60s.")
-                        time.sleep(60)
+                        if self._stop_event.wait(timeout=60):
+                            break
                         continue
 
                     top_signals = self.engine.run_once()[:self.max_signals]
-                    self.stats["signals_generated"] += len(top_signals)
-                    self.stats["last_update"] = now.isoformat()
+                    with self._stats_lock:
+                        self.stats["signals_generated"] += len(top_signals)
+                        self.stats["last_update"] = now.isoformat()
 
                     # Log results of today's trades
                     self.log_trade_results()
 
-                    # Save stats
-                    self.db.update_automation_stats(self.stats)
+                    # Save stats (debounced; flushed on stop as well)
+                    self._stats_dirty = True
+                    self._cycles_since_flush += 1
+                    self._maybe_flush_stats()
 
                     self.last_run_time = now
                     self.logger.info(f"✅ Cycle complete. {len(top_signals)} signals executed. Next run in {self.signal_interval} seconds.")
 
-                time.sleep(30)
+                # Wait exactly until the next deadline; wakes immediately on stop()
+                sleep_for = 0.0
+                if self.last_run_time:
+                    elapsed = (datetime.now() - self.last_run_time).total_seconds()
+                    sleep_for = max(0.0, self.signal_interval - elapsed)
+                if self._stop_event.wait(timeout=sleep_for):
+                    break
 
             except Exception as e:
                 self.logger.error(f"❌ Automation error: {e}", exc_info=True)
-                time.sleep(90)
+                if self._stop_event.wait(timeout=90):
+                    break
 
     def start(self):
         if self.is_running:
             self.logger.warning("⚠️ Automation already running.")
             return False
         self.is_running = True
-        self.automation_thread = threading.Thread(target=self.automation_cycle, daemon=True)
-        self.automation_thread.start()
+        self._stop_event.clear()
+        # Fork a dedicated process so engine.run_once() never contends for
+        # the GIL with the dashboard/API process. Fork (not spawn) so the
+        # child inherits the already-built engine/db/client objects.
+        ctx = multiprocessing.get_context("fork")
+        self.automation_process = ctx.Process(target=self._run_cycle_process, daemon=True)
+        self.automation_process.start()
         self.logger.info("✅ Automation started.")
         return True
 
+    def _run_cycle_process(self):
+        # Only the forking thread survives into the child: rebuild this
+        # module's logging pipeline and the engine's notifier/DB/PDF state
+        # before doing any work, or the cycle runs silent, notifications
+        # land in a dead event loop, and pooled SQLite connections stay
+        # shared with the parent.
+        _install_queue_logging()
+        self.engine.reinit_after_fork()
+        try:
+            self.automation_cycle()
+        finally:
+            # Parent memory is a fork copy; the DB is the shared channel
+            self._maybe_flush_stats(force=True)
+
     def stop(self):
         if not self.is_running:
             self.logger.warning("⚠️ Automation not running.")
             return False
         self.is_running = False
-        if self.automation_thread and self.automation_thread.is_alive():
-            self.automation_thread.join(timeout=10)
+        self._stop_event.set()
+        if self.automation_process and self.automation_process.is_alive():
+            self.automation_process.join(timeout=10)
         self.logger.info("🛑 Automation stopped.")
         return True
 
     def get_status(self):
+        running = bool(self.automation_process and self.automation_process.is_alive())
+        with self._stats_lock:
+            stats = dict(self.stats)
+        last_run_time = self.last_run_time
+        if running:
+            # The cycle runs in a child process; its state reaches us via the
+            # persisted AUTOMATION_STATS row, not shared memory.
+            stats_setting = self.db.get_setting("AUTOMATION_STATS")
+            if stats_setting:
+                stats = orjson.loads(stats_setting)
+            if stats.get("last_update"):
+                try:
+                    last_run_time = datetime.fromisoformat(stats["last_update"])
+                except ValueError:
+                    pass
         return {
-            "running": self.is_running,
+            "running": running,
             "settings": {
                 "interval": self.signal_interval,
                 "max_signals": self.max_signals,
@@ -167,23 +300,19 @@ class AutomatedTrader:
                 "max_daily_trades": self.max_daily_trades,
                 "max_position_pct": self.max_position_pct,
             },
-            "last_run": self.last_run_time.isoformat() if self.last_run_time else None,
-            "next_run": (self.last_run_time + timedelta(seconds=self.signal_interval)).isoformat()
-            if self.last_run_time else None,
-            "stats": self.stats,
+            "last_run": last_run_time.isoformat() if last_run_time else None,
+            "next_run": (last_run_time + timedelta(seconds=self.signal_interval)).isoformat()
+            if last_run_time else None,
+            "stats": stats,
         }
 
     def update_settings(self, new_settings: dict):
-        for key, value in new_settings.items():
-            self.db.set_setting(key, value)
-
-        # Reload
-        self.signal_interval = int(self.db.get_setting("SCAN_INTERVAL") or 3600)
-        self.max_signals = int(self.db.get_setting("TOP_N_SIGNALS") or 5)
-        self.max_drawdown_limit = float(self.db.get_setting("MAX_DRAWDOWN") or 20)
-        self.max_daily_trades = int(self.db.get_setting("MAX_DAILY_TRADES") or 50)
-        self.max_position_pct = float(self.db.get_setting("MAX_POSITION_PCT") or 5)
+        self.db.set_settings({key: str(value) for key, value in new_settings.items()})
+        self._load_automation_settings()
 
 
-# ✅ Singleton instance
-automated_trader = AutomatedTrader()
+# ✅ Singleton accessor — constructed lazily so importing this module does
+# not touch the DB or build the engine until the trader is actually used
+@functools.lru_cache(maxsize=1)
+def get_automated_trader() -> AutomatedTrader:
+    return AutomatedTrader()
@@ -1,10 +1,21 @@
+import asyncio
+import functools
 import os
 import json
 import logging
 import time
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple, Union, List, cast
-from requests.structures import CaseInsensitiveDict
+import heapq
+import threading
+import uuid
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set, Tuple, List, cast
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+from utils import read_capital
 
 logger = logging.getLogger(__name__)
 
@@ -13,33 +24,52 @@ try:
 except ImportError:
     HTTP = None  # type: ignore
 
-def extract_response(
-    response: Union[Dict[str, Any], Tuple[Any, ...]]
-) -> Dict[str, Any]:
-    if isinstance(response, tuple):
-        if len(response) >= 1 and isinstance(response[0], dict):
-            return response[0]
-        logger.warning("Unexpected tuple response format")
-        return {}
-    elif isinstance(response, dict):
-        return response
-    else:
-        logger.warning(f"Unexpected response type: {type(response)}")
-        return {}
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore
 
 class BybitClient:
+    _BASE_URL = "https://api.bybit.com"
+
+    # Seconds a virtual order stays open before it is considered filled
+    VIRTUAL_FILL_DELAY = 30
+
+    # Instrument list changes at most daily; cache it for an hour
+    SYMBOLS_TTL = 3600
+
     def __init__(self):
+        self._aio_session: Optional["aiohttp.ClientSession"] = None
+        # Latency of the most recent API call, for diagnostics
+        self._last_latency_ns = 0
+        # Bound pybit methods resolved once per name, not per call
+        self._method_cache: Dict[str, Callable] = {}
         self.use_real = os.getenv("USE_REAL_TRADING", "").strip().lower() in ("1", "true", "yes")
         self.use_testnet = os.getenv("BYBIT_TESTNET", "").strip().lower() in ("1", "true", "yes")
 
+        # Order/cache state comes before any misconfiguration early-return:
+        # the read-only endpoints must keep degrading to empty results, not
+        # AttributeError, when the client is half-configured.
+        # Indexed by order_id for O(1) cancel/query; per-symbol id sets so
+        # get_open_orders only touches that symbol's orders.
+        self._virtual_orders: Dict[str, Dict[str, Any]] = {}
+        self._orders_by_symbol: Dict[str, Set[str]] = defaultdict(set)
+        # Min-heap of (fill_deadline_epoch, order_id) so the monitor only
+        # wakes when the next order is actually due.
+        self._fill_heap: List[Tuple[float, str]] = []
+        self._monitor_wakeup = threading.Event()
+        # Guards _virtual_orders/_orders_by_symbol/_fill_heap: the monitor
+        # and order placement/cancel may run on different threads
+        self._orders_lock = threading.RLock()
+        # TTL cache for read-only market endpoints: key -> (fetched_at, value)
+        self._response_cache: Dict[Tuple, Tuple[float, Any]] = {}
+
         # Conflict check
         if self.use_real and self.use_testnet:
             logger.error("❌ Both USE_REAL_TRADING and BYBIT_TESTNET are set. Enable only one.")
             self.client = None
             return
 
-        self._virtual_orders: List[Dict[str, Any]] = []
-
         # Try to import pybit's HTTP client
         try:
             from pybit.unified_trading import HTTP
@@ -65,6 +95,7 @@ class BybitClient:
                     api_secret=self.api_secret,
                     testnet=False
                 )
+                self._configure_http_session()
                 logger.info("[BybitClient] ✅ Live trading enabled (mainnet)")
             except Exception as e:
                 logger.exception(f"❌ Failed to initialize Bybit live client: {e}")
@@ -83,11 +114,24 @@ class BybitClient:
             logger.error("❌ Neither USE_REAL_TRADING nor BYBIT_TESTNET is set.")
             self.client = None
 
+    def _configure_http_session(self):
+        """Mount a pooled HTTPAdapter on pybit's underlying requests.Session
+        so TCP+TLS connections are kept alive and reused across calls."""
+        session = getattr(self.client, "client", None)
+        if not isinstance(session, requests.Session):
+            return
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        session.mount("https://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+
     def _load_virtual_wallet(self):
         try:
-            with open("capital.json", "r") as f:
-                self.virtual_wallet = json.load(f)
-                logger.info("[BybitClient] ✅ Loaded virtual wallet from capital.json")
+            self.virtual_wallet = read_capital()
+            logger.info("[BybitClient] ✅ Loaded virtual wallet from capital.json")
         except FileNotFoundError:
             logger.error("❌ capital.json not found.")
             self.virtual_wallet = {}
@@ -99,7 +143,7 @@ class BybitClient:
         self,
         method: str,
         params: Optional[Dict[str, Any]] = None
-    ) -> Tuple[Dict[str, Any], timedelta, CaseInsensitiveDict]:
+    ) -> Dict[str, Any]:
 
         if self.client is None:
             if self.use_testnet:
@@ -108,81 +152,178 @@ class BybitClient:
                 logger.warning("Live mode: client not initialized.")
             else:
                 logger.error("No trading mode set.")
-            return {}, timedelta(), CaseInsensitiveDict()
+            return {}
 
         params = params or {}
-        method_func = getattr(self.client, method, None)
-
-        if not callable(method_func):
-            logger.error(f"❌ Method '{method}' not found in Bybit HTTP client.")
-            return {}, timedelta(), CaseInsensitiveDict()
+        method_func = self._method_cache.get(method)
+        if method_func is None:
+            method_func = getattr(self.client, method, None)
+            if not callable(method_func):
+                logger.error(f"❌ Method '{method}' not found in Bybit HTTP client.")
+                return {}
+            self._method_cache[method] = method_func
 
         try:
-            start_time = datetime.now()
+            # Integer perf counter: no tz handling or datetime allocation
+            t0 = time.perf_counter_ns()
             raw_result = method_func(**params)
-            elapsed = datetime.now() - start_time
+            self._last_latency_ns = time.perf_counter_ns() - t0
 
             if not isinstance(raw_result, dict):
                 logger.warning(f"Unexpected response type from '{method}': {type(raw_result)}. Returning empty dict.")
-                return {}, elapsed, CaseInsensitiveDict()
+                return {}
 
-            result = cast(Dict[str, Any], raw_result)
-            return result, elapsed, CaseInsensitiveDict()
+            return cast(Dict[str, Any], raw_result)
 
         except Exception as e:
             logger.exception(f"❌ Exception during Bybit API call '{method}': {e}")
-            return {}, timedelta(), CaseInsensitiveDict()
+            return {}
+
+    # === Async public-market path (aiohttp) ===
+    # Market-data endpoints are unauthenticated, so they can bypass the sync
+    # pybit client entirely and fan out on one event loop. The signed trading
+    # endpoints stay on the synchronous pybit client.
+
+    async def _get_aio_session(self) -> "aiohttp.ClientSession":
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._aio_session
+
+    async def _send_request_async(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if aiohttp is None:
+            logger.error("❌ aiohttp is not installed; async requests unavailable.")
+            return {}
+        try:
+            session = await self._get_aio_session()
+            async with session.get(f"{self._BASE_URL}{path}", params=params) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+        except Exception as e:
+            logger.exception(f"❌ Exception during async Bybit API call '{path}': {e}")
+            return {}
 
-    def get_orderbook(self, symbol: str, limit: int = 25) -> Dict[str, Any]:
-        params = {"symbol": symbol, "limit": limit}
-        response = self._send_request("orderbook", params)
-        return extract_response(response)
+    async def get_kline_async(self, symbol: str, interval: str, limit: int = 200) -> Dict[str, Any]:
+        params = {"category": "linear", "symbol": symbol, "interval": interval, "limit": str(limit)}
+        return await self._send_request_async("/v5/market/kline", params)
 
-    def get_symbols(self) -> List[str]:
-        response = self._send_request("get_instruments_info", {"category": "linear"})
-        data = extract_response(response)
+    async def get_orderbook_async(self, symbol: str, limit: int = 25) -> Dict[str, Any]:
+        params = {"category": "linear", "symbol": symbol, "limit": str(limit)}
+        return await self._send_request_async("/v5/market/orderbook", params)
+
+    async def get_symbols_async(self) -> List[str]:
+        data = await self._send_request_async("/v5/market/instruments-info", {"category": "linear"})
         if not data or "result" not in data or "list" not in data["result"]:
             return []
         return [item["symbol"] for item in data["result"]["list"]]
 
-    def get_chart_data(self, symbol: str, interval: str, limit: int = 200) -> List[Dict[str, Any]]:
+    async def get_klines_async(self, symbols: List[str], interval: str, limit: int = 200) -> List[Dict[str, Any]]:
+        return await asyncio.gather(
+            *(self.get_kline_async(s, interval, limit) for s in symbols)
+        )
+
+    def get_klines(self, symbols: List[str], interval: str, limit: int = 200) -> List[Dict[str, Any]]:
+        """Sync wrapper: fetch klines for many symbols concurrently, so wall
+        time is the slowest request rather than the sum of all of them."""
+
+        async def _run():
+            try:
+                return await self.get_klines_async(symbols, interval, limit)
+            finally:
+                if self._aio_session and not self._aio_session.closed:
+                    await self._aio_session.close()
+
+        return asyncio.run(_run())
+
+    def get_orderbook(self, symbol: str, limit: int = 25) -> Dict[str, Any]:
+        params = {"symbol": symbol, "limit": limit}
+        return self._send_request("orderbook", params)
+
+    def _cached(self, key: Tuple, ttl: float, fetch):
+        """Return a cached response if younger than ttl, else fetch and store.
+        Falsy results (failed requests) are never cached."""
+        hit = self._response_cache.get(key)
+        if hit and time.time() - hit[0] < ttl:
+            return hit[1]
+        value = fetch()
+        if value:
+            self._response_cache[key] = (time.time(), value)
+        return value
+
+    @staticmethod
+    def _kline_ttl(interval: str) -> float:
+        """Half a bar, floored at 30s. Bybit intervals are minutes as digits
+        ('15', '60', ...) or 'D'/'W'/'M' buckets."""
+        digits = "".join(ch for ch in str(interval) if ch.isdigit())
+        minutes = int(digits) if digits else 1440
+        return max(30.0, minutes * 60 / 2)
+
+    def get_symbols(self) -> List[str]:
+        def fetch():
+            data = self._send_request("get_instruments_info", {"category": "linear"})
+            if not data or "result" not in data or "list" not in data["result"]:
+                return []
+            return [item["symbol"] for item in data["result"]["list"]]
+
+        return self._cached(("symbols",), self.SYMBOLS_TTL, fetch)
+
+    def get_chart_data(self, symbol: str, interval: str, limit: int = 200) -> Dict[str, Any]:
+        """Return candles as column arrays (struct-of-arrays) instead of one
+        dict per row, so parsing is a handful of vectorized casts and
+        downstream indicator code can stay columnar."""
         raw = self.get_kline(symbol, interval, limit)
         if not raw or "result" not in raw or "list" not in raw["result"]:
-            return []
-
-        candles = []
-        for item in raw["result"]["list"]:
-            candles.append({
-                "timestamp": datetime.fromtimestamp(int(item[0]) / 1000),
-                "open": float(item[1]),
-                "high": float(item[2]),
-                "low": float(item[3]),
-                "close": float(item[4]),
-                "volume": float(item[5])
-            })
-        return candles
+            return {}
+
+        rows = raw["result"]["list"]
+        if not rows:
+            return {}
+
+        arr = np.asarray(rows, dtype=object)
+        return {
+            "timestamp": (arr[:, 0].astype(np.int64) // 1000).astype("datetime64[s]"),
+            "open": arr[:, 1].astype(np.float64),
+            "high": arr[:, 2].astype(np.float64),
+            "low": arr[:, 3].astype(np.float64),
+            "close": arr[:, 4].astype(np.float64),
+            "volume": arr[:, 5].astype(np.float64),
+        }
+
+    def get_chart_data_bulk(
+        self, symbols: List[str], interval: str, limit: int = 200
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch chart data for many symbols concurrently. The underlying
+        requests are network-bound and release the GIL while waiting, so a
+        bounded pool collapses N serial round-trips into roughly N/16."""
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            return dict(zip(
+                symbols,
+                pool.map(lambda s: self.get_chart_data(s, interval, limit), symbols),
+            ))
 
     def get_kline(self, symbol: str, interval: str, limit: int = 200) -> Dict[str, Any]:
-        params = {"symbol": symbol, "interval": interval, "limit": limit}
-        response = self._send_request("kline", params)
-        return extract_response(response)
+        def fetch():
+            params = {"symbol": symbol, "interval": interval, "limit": limit}
+            return self._send_request("kline", params)
+
+        key = ("kline", symbol, interval, limit)
+        return self._cached(key, self._kline_ttl(interval), fetch)
 
     def get_balance(self, coin: str = "USD") -> dict:
         # Handle virtual mode
         if self.client is None:
             try:
-                with open("capital.json", "r") as f:
-                    data = json.load(f)
-                    capital = float(data.get("capital", 100.0))
-                    currency = data.get("currency", coin)
-                    return {"capital": capital, "currency": currency}
+                data = read_capital()
+                capital = float(data.get("capital", 100.0))
+                currency = data.get("currency", coin)
+                return {"capital": capital, "currency": currency}
             except Exception as e:
                 logger.warning(f"[BybitClient] Could not load capital.json: {e}")
                 return {"capital": 100.0, "currency": coin}
 
         # Handle real API
-        response = self._send_request("wallet_balance", {"coin": coin})
-        data = extract_response(response)
+        data = self._send_request("wallet_balance", {"coin": coin})
 
         if not data or coin not in data:
             logger.warning(f"[BybitClient] No wallet data for coin '{coin}'.")
@@ -195,8 +336,7 @@ class BybitClient:
         params = {}
         if symbol:
             params["symbol"] = symbol
-        response = self._send_request("positions", params)
-        return extract_response(response)
+        return self._send_request("positions", params)
 
     def place_order(
         self,
@@ -224,10 +364,12 @@ class BybitClient:
                 params["price"] = price
             if order_link_id is not None:
                 params["order_link_id"] = order_link_id
-            response = self._send_request("place_active_order", params)
-            return extract_response(response)
+            return self._send_request("place_active_order", params)
         else:
-            order_id = f"virtual_{int(time.time()*1000)}"
+            # uuid4, not a millisecond timestamp: orders are placed
+            # concurrently, and colliding ids silently overwrite each other
+            # in the _virtual_orders dict
+            order_id = f"virtual_{uuid.uuid4().hex}"
             virtual_order = {
                 "order_id": order_id,
                 "symbol": symbol,
@@ -238,7 +380,10 @@ class BybitClient:
                 "status": "open",
                 "create_time": datetime.now(),
             }
-            self._virtual_orders.append(virtual_order)
+            with self._orders_lock:
+                self._virtual_orders[order_id] = virtual_order
+                self._orders_by_symbol[symbol].add(order_id)
+                heapq.heappush(self._fill_heap, (time.time() + self.VIRTUAL_FILL_DELAY, order_id))
             logger.info(f"Placed virtual order: {virtual_order}")
             return {"order_id": order_id, "result": "success"}
 
@@ -256,58 +401,68 @@ class BybitClient:
                 params["order_id"] = order_id
             else:
                 params["order_link_id"] = order_link_id
-            response = self._send_request("cancel_active_order", params)
-            return extract_response(response)
+            return self._send_request("cancel_active_order", params)
         else:
-            for order in self._virtual_orders:
-                if (order_id and order["order_id"] == order_id) or (order_link_id and order.get("order_link_id") == order_link_id):
+            with self._orders_lock:
+                order = None
+                if order_id:
+                    order = self._virtual_orders.get(order_id)
+                else:
+                    # order_link_id lookups are rare; fall back to a scan
+                    order = next(
+                        (o for o in self._virtual_orders.values()
+                         if o.get("order_link_id") == order_link_id),
+                        None,
+                    )
+                if order:
                     order["status"] = "cancelled"
-                    logger.info(f"Cancelled virtual order: {order}")
-                    return {"result": "success", "order_id": order["order_id"]}
+            if order:
+                logger.info(f"Cancelled virtual order: {order}")
+                return {"result": "success", "order_id": order["order_id"]}
             logger.warning("Virtual order to cancel not found")
             return {"result": "error", "message": "Order not found"}
 
     def get_open_orders(self, symbol: str) -> Dict[str, Any]:
         if self.use_real and self.client:
             params = {"symbol": symbol}
-            response = self._send_request("get_active_order", params)
-            return extract_response(response)
+            return self._send_request("get_active_order", params)
         else:
-            open_orders = [o for o in self._virtual_orders if o["symbol"] == symbol and o["status"] == "open"]
+            with self._orders_lock:
+                open_orders = [
+                    o for o in (self._virtual_orders[oid] for oid in self._orders_by_symbol[symbol])
+                    if o["status"] == "open"
+                ]
             return {"result": "success", "data": open_orders}
 
     def get_order(self, symbol: str, order_id: str) -> Dict[str, Any]:
         if self.use_real and self.client:
             params = {"symbol": symbol, "order_id": order_id}
-            response = self._send_request("query_active_order", params)
-            return extract_response(response)
+            return self._send_request("query_active_order", params)
         else:
-            for order in self._virtual_orders:
-                if order["order_id"] == order_id and order["symbol"] == symbol:
-                    return {"result": "success", "data": order}
+            with self._orders_lock:
+                order = self._virtual_orders.get(order_id)
+            if order and order["symbol"] == symbol:
+                return {"result": "success", "data": order}
             return {"result": "error", "message": "Order not found"}
 
     def get_trade_history(self, symbol: str, limit: int = 50) -> Dict[str, Any]:
         if self.use_real and self.client:
             params = {"symbol": symbol, "limit": limit}
-            response = self._send_request("execution_list", params)
-            return extract_response(response)
+            return self._send_request("execution_list", params)
         else:
             return {"result": "success", "data": []}
 
     def get_wallet_fund_records(self, coin: str = "USDT", limit: int = 50) -> Dict[str, Any]:
         if self.use_real and self.client:
             params = {"coin": coin, "limit": limit}
-            response = self._send_request("wallet_fund_records", params)
-            return extract_response(response)
+            return self._send_request("wallet_fund_records", params)
         else:
             return {"result": "success", "data": []}
 
     def set_leverage(self, symbol: str, leverage: int, leverage_only: bool = False) -> Dict[str, Any]:
         if self.use_real and self.client:
             params = {"symbol": symbol, "leverage": leverage, "leverage_only": leverage_only}
-            response = self._send_request("set_leverage", params)
-            return extract_response(response)
+            return self._send_request("set_leverage", params)
         else:
             logger.info(f"Set virtual leverage {leverage} for {symbol}")
             return {"result": "success", "symbol": symbol, "leverage": leverage}
@@ -317,26 +472,36 @@ class BybitClient:
             raise ValueError("mode must be 'OneWay' or 'HedgeMode'")
         if self.use_real and self.client:
             params = {"mode": mode}
-            response = self._send_request("set_position_mode", params)
-            return extract_response(response)
+            return self._send_request("set_position_mode", params)
         else:
             logger.info(f"Set virtual position mode to {mode}")
             return {"result": "success", "mode": mode}
 
     def monitor_virtual_orders(self, check_interval: int = 10, max_checks: int = 6):
+        """Fill due virtual orders from the deadline heap, sleeping only until
+        the next order is due instead of re-scanning every order each tick."""
         logger.info("Starting virtual orders monitoring...")
-        checks = 0
-        while checks < max_checks and self._virtual_orders:
-            for order in self._virtual_orders:
-                elapsed = datetime.now() - order["create_time"]
-                if order["status"] == "open" and elapsed > timedelta(seconds=30):
+        deadline = time.time() + check_interval * max_checks
+        while True:
+            now = time.time()
+            with self._orders_lock:
+                while self._fill_heap and self._fill_heap[0][0] <= now:
+                    _, order_id = heapq.heappop(self._fill_heap)
+                    order = self._virtual_orders.get(order_id)
+                    if not order or order["status"] != "open":
+                        continue  # cancelled in the meantime
                     order["status"] = "filled"
                     order["fill_time"] = datetime.now()
-                    logger.info(f"Virtual order filled: {order['order_id']} for {order['symbol']} qty {order['qty']}")
-            self._virtual_orders = [o for o in self._virtual_orders if o["status"] != "filled"]
-            time.sleep(check_interval)
-            checks += 1
+                    logger.info(f"Virtual order filled: {order_id} for {order['symbol']} qty {order['qty']}")
+                    self._virtual_orders.pop(order_id)
+                    self._orders_by_symbol[order["symbol"]].discard(order_id)
+                next_due = self._fill_heap[0][0] if self._fill_heap else None
+            if next_due is None or now >= deadline:
+                break
+            self._monitor_wakeup.wait(timeout=min(next_due, deadline) - now)
         logger.info("Finished monitoring virtual orders.")
 
-# Export alias
-bybit_client = BybitClient()
\ No newline at end of file
+# Export accessor — constructed lazily on first use
+@functools.lru_cache(maxsize=1)
+def get_bybit_client() -> BybitClient:
+    return BybitClient()
\ No newline at end of file
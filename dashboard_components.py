@@ -1,78 +1,252 @@
 import os
+import json
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timezone
 
 from utils import format_currency, format_percentage, get_trend_color
-from signal_generator import ema, rsi, bollinger
 from db import db_manager
 
 
+# Cached table builders: Streamlit reruns the whole script on every widget
+# interaction, so the row-by-row DataFrame construction is hoisted out and
+# keyed on a stable JSON form of the input.
+
+def _column(df: pd.DataFrame, name: str, default=None) -> pd.Series:
+    """Column lookup that broadcasts a default when the key is absent."""
+    if name in df.columns:
+        return df[name] if default is None else df[name].fillna(default)
+    return pd.Series(default, index=df.index)
+
+
+def _numeric(df: pd.DataFrame, name: str, default=0.0) -> pd.Series:
+    return pd.to_numeric(_column(df, name, default), errors='coerce').fillna(default)
+
+
+@st.cache_data
+def _compute_indicators(close_tuple, want_ema9, want_ema21, want_bb, want_rsi):
+    """Memoized indicator pass. Keyed on the close series itself, so
+    unchanged klines hit the cache on every rerun.
+
+    Returns full-length arrays: signal_generator's ema/rsi/bollinger yield
+    only the latest value, which drew flat horizontal lines on the chart."""
+    close = pd.Series(close_tuple, dtype='float64')
+    out = {}
+    if want_ema9:
+        out['ema9'] = close.ewm(span=9, adjust=False).mean().to_numpy()
+    if want_ema21:
+        out['ema21'] = close.ewm(span=21, adjust=False).mean().to_numpy()
+    if want_bb:
+        mid = close.rolling(20).mean()
+        std = close.rolling(20).std(ddof=0)
+        out['bollinger'] = (
+            (mid + 2 * std).to_numpy(), mid.to_numpy(), (mid - 2 * std).to_numpy()
+        )
+    if want_rsi:
+        delta = close.diff()
+        gains = delta.clip(lower=0).rolling(14).mean()
+        losses = (-delta).clip(lower=0).rolling(14).mean()
+        rs = gains / (losses + 1e-10)
+        out['rsi'] = (100 - 100 / (1 + rs)).to_numpy()
+    return out
+
+
+# Display-time formatters (pandas Styler) — cells stay numeric in the frame
+_SIGNAL_FORMATS = {
+    'Entry': '${:.2f}', 'TP': '${:.2f}', 'SL': '${:.2f}',
+    'Margin USDT': '${:.2f}', 'Confidence': '{:g}%', 'Leverage': '{:g}x',
+}
+_TRADE_FORMATS = {
+    'Entry': '${:.2f}', 'Exit': '${:.2f}',
+    'Margin USDT': '${:.2f}', 'Leverage': '{:g}x',
+}
+
+
+# Below this row count, pandas' per-record parsing overhead exceeds the
+# display cost — a dict-of-lists build is ~2x cheaper for typical pages
+_SMALL_TABLE_ROWS = 100
+
+
+def _price(record, key, alt):
+    val = record.get(key)
+    if val is None:
+        val = record.get(alt, 0)
+    return float(val or 0)
+
+
+@st.cache_data(ttl=60)
+def _signals_to_df(signals_json: str) -> pd.DataFrame:
+    signals = json.loads(signals_json)
+
+    if len(signals) < _SMALL_TABLE_ROWS:
+        # Columnar fast path: one comprehension per column, then a light
+        # dict-of-lists DataFrame build
+        return pd.DataFrame({
+            'Symbol': [s.get('symbol', 'N/A') for s in signals],
+            'Side': [s.get('side', 'N/A') for s in signals],
+            'Strategy': [s.get('strategy', 'N/A') for s in signals],
+            'Entry': [_price(s, 'entry_price', 'entry') for s in signals],
+            'TP': [_price(s, 'tp_price', 'tp') for s in signals],
+            'SL': [_price(s, 'sl_price', 'sl') for s in signals],
+            'Confidence': [float(s.get('score') or 0) for s in signals],
+            'Leverage': [float(s.get('leverage') or 20) for s in signals],
+            'Margin USDT': [float(s.get('margin_usdt') or 0) for s in signals],
+            'Trend': [s.get('trend', 'N/A') for s in signals],
+            'Timestamp': [s.get('timestamp', 'N/A') for s in signals],
+        })
+
+    # from_records does one C-level columnar extraction over the dict list
+    df = pd.DataFrame.from_records(signals)
+
+    # Coalesce the two price-key conventions (entry_price vs entry) columnwise
+    for col, alt in (('entry_price', 'entry'), ('tp_price', 'tp'), ('sl_price', 'sl')):
+        series = df[col] if col in df.columns else pd.Series(np.nan, index=df.index)
+        if alt in df.columns:
+            series = series.fillna(df[alt])
+        df[col] = pd.to_numeric(series, errors='coerce').fillna(0.0)
+
+    # Numeric columns stay numeric; display formatting is applied via
+    # Styler.format so sorting in the UI remains numeric.
+    # Single constructor call — one allocation instead of an insert per column
+    return pd.DataFrame({
+        'Symbol': _column(df, 'symbol', 'N/A'),
+        'Side': _column(df, 'side', 'N/A'),
+        'Strategy': _column(df, 'strategy', 'N/A'),
+        'Entry': df['entry_price'],
+        'TP': df['tp_price'],
+        'SL': df['sl_price'],
+        'Confidence': _numeric(df, 'score', 0),
+        'Leverage': _numeric(df, 'leverage', 20),
+        'Margin USDT': _numeric(df, 'margin_usdt'),
+        'Trend': _column(df, 'trend', 'N/A'),
+        'Timestamp': _column(df, 'timestamp', 'N/A'),
+    })
+
+
+@st.cache_data(ttl=60)
+def _trades_to_df(trades_json: str) -> pd.DataFrame:
+    trades = json.loads(trades_json)
+
+    if len(trades) < _SMALL_TABLE_ROWS:
+        pnls = [float(t.get('pnl') or 0) for t in trades]
+        return pd.DataFrame({
+            'Symbol': [t.get('symbol') for t in trades],
+            'Side': [t.get('side') for t in trades],
+            'Entry': [float(t.get('entry') or 0) for t in trades],
+            'Exit': [float(t.get('exit') or 0) for t in trades],
+            'Qty': [t.get('qty') for t in trades],
+            'Leverage': [float(t.get('leverage') or 20) for t in trades],
+            'Margin USDT': [float(t.get('margin_usdt') or 0) for t in trades],
+            'P&L': [f"{'🟢' if p > 0 else '🔴'} ${p:.2f}" for p in pnls],
+            'Strategy': [t.get('strategy', 'N/A') for t in trades],
+            'Timestamp': [t.get('timestamp') for t in trades],
+        })
+
+    df = pd.DataFrame.from_records(trades)
+    pnl = _numeric(df, 'pnl')
+    markers = pd.Series(np.where(pnl > 0, '🟢', '🔴'), index=df.index, dtype=object)
+
+    return pd.DataFrame({
+        'Symbol': _column(df, 'symbol'),
+        'Side': _column(df, 'side'),
+        'Entry': _numeric(df, 'entry'),
+        'Exit': _numeric(df, 'exit'),
+        'Qty': _column(df, 'qty'),
+        'Leverage': _numeric(df, 'leverage', 20),
+        'Margin USDT': _numeric(df, 'margin_usdt'),
+        'P&L': markers + pnl.map(' ${:.2f}'.format).astype(object),
+        'Strategy': _column(df, 'strategy', 'N/A'),
+        'Timestamp': _column(df, 'timestamp'),
+    })
+
+
+@st.cache_data(ttl=3)
+def _build_ticker_html(ticker_json: str) -> str:
+    """Clean + rank + format the ticker once per exchange refresh window;
+    rapid widget-driven reruns in between hit the cache."""
+    ticker_data = json.loads(ticker_json)
+
+    cleaned = []
+    for item in ticker_data:
+        symbol = item.get('symbol')
+        if not symbol:
+            continue
+        vol_raw = item.get('turnover24h') or item.get('volume24h') or 0
+        try:
+            cleaned.append({
+                'symbol': symbol,
+                'price': float(item.get('lastPrice', 0)),
+                'change': float(item.get('price24hPcnt', 0)) * 100,
+                'volume': float(vol_raw),
+            })
+        except (TypeError, ValueError):
+            # Malformed numeric fields only — a bare except here also
+            # swallowed KeyboardInterrupt and the like
+            continue
+
+    # O(N) partial selection of the top 50 by volume; only the survivors
+    # pay for the final ordering sort
+    top_n = 50
+    if len(cleaned) > top_n:
+        vols = np.fromiter((c['volume'] for c in cleaned), np.float64, len(cleaned))
+        keep = np.argpartition(-vols, top_n)[:top_n]
+        cleaned = [cleaned[i] for i in keep]
+    top_50 = sorted(cleaned, key=lambda x: x['volume'], reverse=True)
+    if not top_50:
+        return ""
+
+    # Column-wise formatting; one join over pre-built fragments instead
+    # of three f-string format calls per row
+    df = pd.DataFrame(top_50)
+    price_s = df['price'].map('${:.6f}'.format)
+    change_s = df['change'].map('{:.2f}%'.format)
+    vol_s = df['volume'].map('${:,.0f}'.format)
+    color = np.where(df['change'] > 0, '#00cc66', '#ff4d4d')
+    return " | ".join(
+        ('<b>' + df['symbol'] + '</b>: ' + price_s
+         + " (<span style='color:" + color + "'>" + change_s + '</span>) '
+         + 'Vol: ' + vol_s).tolist()
+    )
+
+
 class DashboardComponents:
     def __init__(self):
         pass
 
     def display_signal_card(self, signal):
-        col1, col2 = st.columns([2, 1])
         entry = signal.get('entry_price', signal.get('entry', 0)) or 0
         tp = signal.get('tp_price', signal.get('tp', 0)) or 0
         sl = signal.get('sl_price', signal.get('sl', 0)) or 0
         leverage = signal.get('leverage', 20)
         margin_usdt = signal.get('margin_usdt', 0.0)
         confidence = signal.get('score', 0)
-
-        with col1:
-            st.markdown(f"**{signal.get('symbol', 'N/A')}** - {signal.get('side', 'N/A')}")
-            st.markdown(f"Strategy: {signal.get('strategy', 'N/A')}")
-            st.markdown(f"Entry: ${entry:.2f} | TP: ${tp:.2f} | SL: ${sl:.2f}")
-            st.markdown(f"Leverage: {leverage}x | Margin: ${margin_usdt:.2f}")
-
-        with col2:
-            confidence_color = "green" if confidence >= 75 else "orange" if confidence >= 60 else "red"
-            st.markdown(f"""
-                <div style='background-color: {confidence_color}; color: white; padding: 6px; 
+        confidence_color = "green" if confidence >= 75 else "orange" if confidence >= 60 else "red"
+
+        # One element per card — the old version emitted five, and the
+        # per-element transfer cost adds up when a page lists many signals
+        st.markdown(f"""
+            <div style='display: grid; grid-template-columns: 2fr 1fr; gap: 12px;
+            align-items: center; margin-bottom: 10px;'>
+                <div>
+                    <b>{signal.get('symbol', 'N/A')}</b> - {signal.get('side', 'N/A')}<br>
+                    Strategy: {signal.get('strategy', 'N/A')}<br>
+                    Entry: ${entry:.2f} | TP: ${tp:.2f} | SL: ${sl:.2f}<br>
+                    Leverage: {leverage}x | Margin: ${margin_usdt:.2f}
+                </div>
+                <div style='background-color: {confidence_color}; color: white; padding: 6px;
                 border-radius: 6px; text-align: center; font-weight: bold'>
                 {confidence}% Confidence</div>
-            """, unsafe_allow_html=True)
+            </div>
+        """, unsafe_allow_html=True)
 
     def display_signals_table(self, signals):
-        def safe_get(signal, key, default=0.0):
-            val = signal.get(key)
-            if val is None:
-                val = signal.get(key.replace('_price', ''), default)
-            return val
-
-        df = pd.DataFrame([{
-            'Symbol': s.get('symbol', 'N/A'),
-            'Side': s.get('side', 'N/A'),
-            'Strategy': s.get('strategy', 'N/A'),
-            'Entry': f"${safe_get(s, 'entry_price'):.2f}",
-            'TP': f"${safe_get(s, 'tp_price'):.2f}",
-            'SL': f"${safe_get(s, 'sl_price'):.2f}",
-            'Confidence': f"{s.get('score', 0)}%",
-            'Leverage': f"{s.get('leverage', 20)}x",
-            'Margin USDT': f"${s.get('margin_usdt', 0):.2f}",
-            'Trend': s.get('trend', 'N/A'),
-            'Timestamp': s.get('timestamp', 'N/A')
-        } for s in signals])
-        st.dataframe(df, use_container_width=True, height=400)
+        df = _signals_to_df(json.dumps(signals, default=str))
+        st.dataframe(df.style.format(_SIGNAL_FORMATS), use_container_width=True, height=400)
 
     def display_trades_table(self, trades):
-        df = pd.DataFrame([{
-            'Symbol': t.get('symbol'),
-            'Side': t.get('side'),
-            'Entry': f"${t.get('entry', 0):.2f}",
-            'Exit': f"${t.get('exit', 0):.2f}",
-            'Qty': t.get('qty'),
-            'Leverage': f"{t.get('leverage', 20)}x",
-            'Margin USDT': f"${t.get('margin_usdt', 0):.2f}",
-            'P&L': f"{'🟢' if float(t.get('pnl') or 0) > 0 else '🔴'} ${float(t.get('pnl') or 0):.2f}",
-            'Strategy': t.get('strategy', 'N/A'),
-            'Timestamp': t.get('timestamp')
-        } for t in trades])
-        st.dataframe(df, use_container_width=True, height=400)
+        df = _trades_to_df(json.dumps(trades, default=str))
+        st.dataframe(df.style.format(_TRADE_FORMATS), use_container_width=True, height=400)
 
     def display_trade_statistics(self, stats):
         col1, col2, col3 = st.columns(3)
@@ -87,139 +261,166 @@ class DashboardComponents:
             st.metric("Avg Loss", f"${format_currency(stats.get('avg_loss', 0))}")
 
     def create_portfolio_performance_chart(self, trades, start_balance=10.0):
+        # Lazy import: plotly costs ~300ms cold and only the chart pages
+        # need it; after the first call this is a cached-module lookup
+        import plotly.graph_objects as go
+
         if not trades:
             return go.Figure()
 
-        pnl_data, dates = [], []
-        cumulative = start_balance
-        for t in trades:
-            pnl = float(t.get('pnl') or 0)
-            cumulative += pnl
-            pnl_data.append(cumulative)
-            try:
-                dt = datetime.fromisoformat(t['timestamp'])
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                dates.append(dt)
-            except Exception:
-                dates.append(datetime.now(timezone.utc))
-
-        fig = go.Figure(go.Scatter(x=dates, y=pnl_data, mode='lines+markers',
-                                   line=dict(color='#00d4aa', width=2)))
+        df = pd.DataFrame(trades)
+        # One vectorized parse for the whole column; unparseable rows fall
+        # back to "now" like the old per-row try/except did
+        dates = pd.to_datetime(_column(df, 'timestamp'), errors='coerce', utc=True)
+        dates = dates.fillna(pd.Timestamp.now(tz='UTC'))
+
+        pnl_arr = np.fromiter(
+            (float(t.get('pnl') or 0) for t in trades), dtype=np.float64, count=len(trades)
+        )
+        # Plotly accepts NumPy arrays directly — no list round-trip needed.
+        # float32 halves the JSON payload shipped to the browser and chart
+        # coordinates don't need double precision
+        pnl_data = (start_balance + np.cumsum(pnl_arr)).astype(np.float32)
+
+        # Scattergl renders via WebGL — one GPU draw call instead of an SVG
+        # node per point, which matters once the curve passes a few thousand
+        # trades
+        fig = go.Figure(go.Scattergl(x=dates, y=pnl_data, mode='lines+markers',
+                                     line=dict(color='#00d4aa', width=2)))
         fig.update_layout(title="Portfolio Performance", height=400,
                           xaxis_title="Time", yaxis_title="Portfolio ($)",
                           template="plotly_dark")
         return fig
 
     def create_detailed_performance_chart(self, trades, start_balance=10.0):
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
         if not trades:
             return go.Figure()
 
-        cumulative, daily_pnl, dates = [], [], []
-        running_total = start_balance
-        for t in trades:
-            pnl = float(t.get('pnl') or 0)
-            running_total += pnl
-            cumulative.append(running_total)
-            daily_pnl.append(pnl)
-            try:
-                dt = datetime.fromisoformat(t['timestamp'])
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                dates.append(dt)
-            except Exception:
-                dates.append(datetime.now(timezone.utc))
+        df = pd.DataFrame(trades)
+        dates = pd.to_datetime(_column(df, 'timestamp'), errors='coerce', utc=True)
+        dates = dates.fillna(pd.Timestamp.now(tz='UTC'))
+
+        daily_pnl = np.fromiter(
+            (float(t.get('pnl') or 0) for t in trades), dtype=np.float64, count=len(trades)
+        )
+        cumulative = (start_balance + np.cumsum(daily_pnl)).astype(np.float32)
+        daily_pnl = daily_pnl.astype(np.float32)
 
         fig = make_subplots(rows=2, cols=1, row_heights=[0.7, 0.3], vertical_spacing=0.05,
                             subplot_titles=['Cumulative P&L', 'Daily P&L'])
 
-        fig.add_trace(go.Scatter(x=dates, y=cumulative, mode='lines+markers', name='Equity',
-                                 line=dict(color='lime')), row=1, col=1)
+        fig.add_trace(go.Scattergl(x=dates, y=cumulative, mode='lines+markers', name='Equity',
+                                   line=dict(color='lime')), row=1, col=1)
         fig.add_trace(go.Bar(x=dates, y=daily_pnl, name='Daily P&L',
-                             marker_color=['green' if x > 0 else 'red' for x in daily_pnl]), row=2, col=1)
+                             marker_color=np.where(daily_pnl > 0, 'green', 'red')), row=2, col=1)
 
         fig.update_layout(template='plotly_dark', height=600, showlegend=False)
         return fig
 
     def create_technical_chart(self, chart_data, symbol, indicators):
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
         if not chart_data:
             return go.Figure()
 
         df = pd.DataFrame(chart_data)
         df['timestamp'] = pd.to_datetime(df['timestamp'])
+        ohlcv = ['open', 'high', 'low', 'close', 'volume']
+        df[ohlcv] = df[ohlcv].astype(np.float32)
+        # One Series -> ndarray conversion shared by every trace below
+        ts = df['timestamp'].to_numpy()
+        ts_min, ts_max = ts.min(), ts.max()
         close = df['close'].tolist()
         open_ = df['open'].tolist()
 
+        computed = _compute_indicators(
+            tuple(close),
+            'EMA 9' in indicators,
+            'EMA 21' in indicators,
+            'Bollinger Bands' in indicators,
+            'RSI' in indicators,
+        )
+
         fig = make_subplots(rows=3, cols=1, row_heights=[0.6, 0.2, 0.2], vertical_spacing=0.03,
                             subplot_titles=(f'{symbol} Price Chart', 'Volume', 'RSI'))
 
         fig.add_trace(go.Candlestick(
-            x=df['timestamp'], open=df['open'], high=df['high'],
+            x=ts, open=df['open'], high=df['high'],
             low=df['low'], close=df['close'], name="Candles"), row=1, col=1)
 
         if 'EMA 9' in indicators:
-            ema9 = ema(close, 9)
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=[ema9]*len(df), name="EMA 9", line=dict(color='orange')), row=1, col=1)
+            fig.add_trace(go.Scatter(x=ts, y=computed['ema9'], name="EMA 9", line=dict(color='orange')), row=1, col=1)
 
         if 'EMA 21' in indicators:
-            ema21 = ema(close, 21)
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=[ema21]*len(df), name="EMA 21", line=dict(color='blue')), row=1, col=1)
+            fig.add_trace(go.Scatter(x=ts, y=computed['ema21'], name="EMA 21", line=dict(color='blue')), row=1, col=1)
 
         if 'Bollinger Bands' in indicators:
-            bb_result = bollinger(close)
-            if bb_result and all(bb_result):
-                upper, mid, lower = bb_result
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=[upper]*len(df), name="BB Upper", line=dict(color='gray', dash='dot')), row=1, col=1)
-                fig.add_trace(go.Scatter(x=df['timestamp'], y=[lower]*len(df), name="BB Lower", line=dict(color='gray', dash='dot')), row=1, col=1)
+            upper, mid, lower = computed['bollinger']
+            fig.add_trace(go.Scatter(x=ts, y=upper, name="BB Upper", line=dict(color='gray', dash='dot')), row=1, col=1)
+            fig.add_trace(go.Scatter(x=ts, y=lower, name="BB Lower", line=dict(color='gray', dash='dot')), row=1, col=1)
 
-        bar_colors = ['green' if c > o else 'red' for c, o in zip(df['close'], df['open'])]
-        fig.add_trace(go.Bar(x=df['timestamp'], y=df['volume'], marker_color=bar_colors), row=2, col=1)
+        bar_colors = np.where(df['close'].to_numpy() > df['open'].to_numpy(), 'green', 'red')
+        fig.add_trace(go.Bar(x=ts, y=df['volume'], marker_color=bar_colors), row=2, col=1)
 
         if 'RSI' in indicators:
-            rsi_values = rsi(close)
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=[rsi_values]*len(df), name='RSI', line=dict(color='purple')), row=3, col=1)
-            fig.add_shape(type="line", x0=df['timestamp'].min(), x1=df['timestamp'].max(), y0=70, y1=70,
+            fig.add_trace(go.Scatter(x=ts, y=computed['rsi'], name='RSI', line=dict(color='purple')), row=3, col=1)
+            fig.add_shape(type="line", x0=ts_min, x1=ts_max, y0=70, y1=70,
                           line=dict(color="red", dash="dash"), row=3, col=1)
-            fig.add_shape(type="line", x0=df['timestamp'].min(), x1=df['timestamp'].max(), y0=30, y1=30,
+            fig.add_shape(type="line", x0=ts_min, x1=ts_max, y0=30, y1=30,
                           line=dict(color="green", dash="dash"), row=3, col=1)
 
         fig.update_layout(template='plotly_dark', height=800, xaxis_rangeslider_visible=False)
         return fig
 
     def render_ticker(self, ticker_data, position='top'):
+        self._render_ticker_fragment(ticker_data, position)
+
+    # Fragment: the ticker refreshes on its own 5s cadence without forcing
+    # (or waiting for) a full script rerun
+    @st.fragment(run_every="5s")
+    def _render_ticker_fragment(self, ticker_data, position='top'):
         if not ticker_data:
             return
 
-        cleaned = []
-        for item in ticker_data:
-            try:
-                symbol = item.get('symbol')
-                price = float(item.get('lastPrice', 0))
-                change = float(item.get('price24hPcnt', 0)) * 100
-                volume = float(item.get('turnover24h') or item.get('volume24h') or 0)
-                cleaned.append({'symbol': symbol, 'price': price, 'change': change, 'volume': volume})
-            except:
-                continue
-
-        top_50 = sorted(cleaned, key=lambda x: x['volume'], reverse=True)[:50]
-        ticker_html = " | ".join([
-            f"<b>{x['symbol']}</b>: ${x['price']:.6f} "
-            f"(<span style='color:{'#00cc66' if x['change'] > 0 else '#ff4d4d'}'>{x['change']:.2f}%</span>) "
-            f"Vol: ${x['volume']:,.0f}"
-            for x in top_50
-        ])
+        ticker_html = _build_ticker_html(json.dumps(ticker_data, sort_keys=True, default=str))
 
         if ticker_html:
+            # CSS keyframe scroll runs on the browser's compositor thread;
+            # <marquee> is deprecated and re-triggers layout on rerenders.
+            # Content is doubled once so the loop wraps seamlessly at -50%.
             st.markdown(f"""
-                <div style='position: fixed; {position}: 0; left: 0; width: 100%; background-color: #111; 
-                color: white; padding: 10px; font-family: monospace; font-size: 16px; 
+                <style>
+                @keyframes ticker-scroll {{
+                    from {{ transform: translateX(0); }}
+                    to {{ transform: translateX(-50%); }}
+                }}
+                .ticker-track {{
+                    display: inline-block;
+                    white-space: nowrap;
+                    animation: ticker-scroll 60s linear infinite;
+                    will-change: transform;
+                }}
+                </style>
+                <div style='position: fixed; {position}: 0; left: 0; width: 100%; background-color: #111;
+                color: white; padding: 10px; font-family: monospace; font-size: 16px;
                 white-space: nowrap; overflow: hidden; z-index: 9999;' >
-                    <marquee>{ticker_html}</marquee>
+                    <div class='ticker-track'>{ticker_html} | {ticker_html}</div>
                 </div>
             """, unsafe_allow_html=True)
 
     def render_real_mode_toggle(self):
-        real_mode = st.checkbox("✅ Enable Real Bybit Trading", value=os.getenv("USE_REAL_TRADING", "false") == "true")
-        os.environ["USE_REAL_TRADING"] = str(real_mode).lower()
-        db_manager.set_setting("real_trading", str(real_mode).lower())
+        prev = st.session_state.get("real_mode")
+        if prev is None:
+            prev = os.getenv("USE_REAL_TRADING", "false") == "true"
+        real_mode = st.checkbox("✅ Enable Real Bybit Trading", value=prev)
+        # Only write through on an actual change — the unconditional
+        # set_setting cost a DB round-trip on every rerun
+        if real_mode != st.session_state.get("real_mode"):
+            os.environ["USE_REAL_TRADING"] = str(real_mode).lower()
+            db_manager.set_setting("real_trading", str(real_mode).lower())
+            st.session_state["real_mode"] = real_mode
         return real_mode
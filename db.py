@@ -1,25 +1,36 @@
 import os
-import json
-from datetime import datetime, date, timezone
+import time
+import orjson
+from datetime import datetime, timezone
 from typing import List, Optional, Dict
 from sqlalchemy import (
-    create_engine, String, Integer, Float, DateTime, Boolean, JSON, text
+    create_engine, event, func, insert, lambda_stmt, select, update, Index,
+    String, Integer, Float, DateTime, Boolean, JSON, text
 )
+from contextlib import contextmanager
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import (
-    declarative_base, sessionmaker, Session, Mapped, mapped_column
+    declarative_base, sessionmaker, scoped_session, raiseload,
+    Session, Mapped, mapped_column
 )
 
+# JSON columns: orjson codec (C implementation) via the engine's
+# json_serializer hooks; native JSONB when running on Postgres
+JSONColumn = JSON().with_variant(JSONB(), "postgresql")
+
 Base = declarative_base()
 
 # === SQLAlchemy Models ===
 class Signal(Base):
     __tablename__ = 'signals'
+    # Serves the symbol-filtered ORDER BY created_at DESC LIMIT N path
+    __table_args__ = (Index('ix_signals_symbol_created', 'symbol', 'created_at'),)
     id: Mapped[int] = mapped_column(primary_key=True)
-    symbol: Mapped[str] = mapped_column(String)
+    symbol: Mapped[str] = mapped_column(String, index=True)
     interval: Mapped[str] = mapped_column(String)
     signal_type: Mapped[str] = mapped_column(String)
     score: Mapped[float] = mapped_column(Float)
-    indicators: Mapped[dict] = mapped_column(JSON)
+    indicators: Mapped[dict] = mapped_column(JSONColumn)
     strategy: Mapped[str] = mapped_column(String, default="Default")
     side: Mapped[str] = mapped_column(String, default="LONG")
     sl: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -28,7 +39,14 @@ class Signal(Base):
     margin_usdt: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     entry: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     market: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # server_default lets fresh databases stamp rows themselves; the
+    # client-side default stays because create_all skips existing tables,
+    # so databases created before this column had a DDL default would
+    # otherwise fail NOT NULL on every insert
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), index=True,
+        default=lambda: datetime.now(timezone.utc), server_default=func.now(),
+    )
 
     def to_dict(self):
         return {
@@ -50,8 +68,10 @@ class Signal(Base):
 
 class Trade(Base):
     __tablename__ = 'trades'
+    # Serves the daily-PnL aggregate and the open-trades filter
+    __table_args__ = (Index('ix_trades_status_timestamp', 'status', 'timestamp'),)
     id: Mapped[int] = mapped_column(primary_key=True)
-    symbol: Mapped[str] = mapped_column(String)
+    symbol: Mapped[str] = mapped_column(String, index=True)
     side: Mapped[str] = mapped_column(String)
     qty: Mapped[float] = mapped_column(Float)
     entry_price: Mapped[float] = mapped_column(Float)
@@ -61,9 +81,15 @@ class Trade(Base):
     leverage: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     margin_usdt: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     pnl: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # default + server_default for the same pre-existing-schema reason as
+    # Signal.created_at
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), index=True,
+        default=lambda: datetime.now(timezone.utc), server_default=func.now(),
+    )
+    # status is the leading column of ix_trades_status_timestamp already
     status: Mapped[str] = mapped_column(String)
-    order_id: Mapped[str] = mapped_column(String)
+    order_id: Mapped[str] = mapped_column(String, index=True)
     virtual: Mapped[bool] = mapped_column(Boolean, default=True)
 
     def to_dict(self):
@@ -91,7 +117,11 @@ class Portfolio(Base):
     qty: Mapped[float] = mapped_column(Float)
     avg_price: Mapped[float] = mapped_column(Float)
     value: Mapped[float] = mapped_column(Float)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc), server_default=func.now(),
+        onupdate=func.now(),
+    )
     capital: Mapped[float] = mapped_column(Float, nullable=False, default=100.0)
 
     def to_dict(self):
@@ -104,6 +134,15 @@ class Portfolio(Base):
             "capital": self.capital,
         }
 
+class DailyStats(Base):
+    """Running per-day PnL aggregates, maintained on close_trade — lets
+    get_daily_pnl_pct read one row instead of re-scanning the day's trades."""
+    __tablename__ = 'daily_stats'
+    date: Mapped[str] = mapped_column(String, primary_key=True)  # YYYY-MM-DD (UTC)
+    sum_pnl: Mapped[float] = mapped_column(Float, default=0.0)
+    sum_entry_value: Mapped[float] = mapped_column(Float, default=0.0)
+
+
 class SystemSetting(Base):
     __tablename__ = 'settings'
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -114,9 +153,79 @@ class SystemSetting(Base):
 # === Engine + SessionLocal ===
 
 db_url = os.getenv("DATABASE_URL", "sqlite:///trading.db")
-engine = create_engine(db_url, echo=False)
-SessionLocal = sessionmaker(bind=engine)
-Base.metadata.create_all(engine)
+
+
+def _make_engine(url: str):
+    """Engine with an explicit pool: the default QueuePool of 5 serializes
+    concurrent dashboard/worker sessions, and pre_ping catches stale
+    connections before they fail a real query."""
+    kwargs = dict(
+        echo=False, future=True, pool_pre_ping=True, pool_recycle=1800,
+        # orjson is 2-5x faster than the stdlib codec SQLAlchemy defaults
+        # to for JSON columns — it dominates hydration of big indicators
+        json_serializer=lambda obj: orjson.dumps(obj).decode(),
+        json_deserializer=orjson.loads,
+    )
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        kwargs.update(pool_size=20, max_overflow=10)
+    new_engine = create_engine(url, **kwargs)
+
+    if url.startswith("sqlite"):
+        @event.listens_for(new_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+            # WAL lets readers run alongside the writer instead of blocking
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+
+    return new_engine
+
+
+def _ensure_indexes(target_engine):
+    """create_all skips tables that already exist, so declared indexes
+    never reach a database created before they were added. Backfill them
+    here; existing ones are left alone via checkfirst."""
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            try:
+                index.create(target_engine, checkfirst=True)
+            except Exception as e:
+                print(f"[DB] ⚠️ Could not create index {index.name}: {e}")
+
+
+engine = _make_engine(db_url)
+# scoped_session: each thread reuses one session (and its checked-out
+# connection) across helper calls instead of paying a fresh checkout and
+# BEGIN/COMMIT per call
+# expire_on_commit=False: the default expires every instance on commit, so
+# merely logging a just-written row triggered a hidden refresh SELECT (or a
+# DetachedInstanceError once the session was closed)
+_session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+SessionLocal = scoped_session(_session_factory)
+
+
+@event.listens_for(_session_factory, "do_orm_execute")
+def _default_raiseload(execute_state):
+    """Lazy-load-by-accident policy: as relationships get added to these
+    models, any attribute that isn't eagerly loaded raises instead of
+    silently issuing an N+1 query per row. Opt in per query with
+    selectinload(...) where a relationship is actually needed."""
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+    ):
+        execute_state.statement = execute_state.statement.options(raiseload("*"))
+
+# DB_AUTO_CREATE=false skips the DDL/reflection pass on import for
+# deployments that manage the schema out of band
+if os.getenv("DB_AUTO_CREATE", "true").lower() == "true":
+    Base.metadata.create_all(engine)
+    _ensure_indexes(engine)
 
 
 # === Utility ===
@@ -131,34 +240,122 @@ def serialize_datetimes(obj):
     return obj
 
 
+# Hot-path statements as lambda_stmt: SQLAlchemy caches the constructed and
+# compiled SQL keyed on the lambdas' code identity, so repeat calls only bind
+# fresh parameter values instead of rebuilding the statement each time.
+
+def _signals_select(symbol: Optional[str], limit: int):
+    stmt = lambda_stmt(lambda: select(Signal).order_by(Signal.created_at.desc()))
+    if symbol:
+        stmt += lambda s: s.where(Signal.symbol == symbol)
+    stmt += lambda s: s.limit(limit)
+    return stmt
+
+
+def _trades_select(symbol: Optional[str], limit: int):
+    stmt = lambda_stmt(lambda: select(Trade).order_by(Trade.timestamp.desc()))
+    if symbol:
+        stmt += lambda s: s.where(Trade.symbol == symbol)
+    stmt += lambda s: s.limit(limit)
+    return stmt
+
+
 # === Database Manager ===
 
 class DatabaseManager:
-    def __init__(self, db_url: str):
-        self.engine = create_engine(db_url, echo=False)
-        self.Session = sessionmaker(bind=self.engine)
-        Base.metadata.create_all(self.engine)
-
-        self.settings = {
-            "SCAN_INTERVAL": 3600,
-            "TOP_N_SIGNALS": 5,
-            "MAX_LOSS_PCT": -15.0,
-            "TP_PERCENT": 0.30,
-            "SL_PERCENT": 0.15,
-            "LEVERAGE": 20,
-            "RISK_PER_TRADE": 0.01,
-        }
-        self._load_settings_from_file()
+    DEFAULT_SETTINGS = {
+        "SCAN_INTERVAL": 3600,
+        "TOP_N_SIGNALS": 5,
+        "MAX_LOSS_PCT": -15.0,
+        "TP_PERCENT": 0.30,
+        "SL_PERCENT": 0.15,
+        "LEVERAGE": 20,
+        "RISK_PER_TRADE": 0.01,
+    }
+
+    def __init__(self, db_url: str = db_url):
+        # Reuse the module-level engine for the default URL — building a
+        # second one doubled the connection pool and repeated the DDL pass
+        if db_url == globals()["db_url"]:
+            self.engine = engine
+            self.Session = SessionLocal
+        else:
+            self.engine = _make_engine(db_url)
+            self.Session = scoped_session(
+                sessionmaker(bind=self.engine, expire_on_commit=False)
+            )
+            Base.metadata.create_all(self.engine)
+            _ensure_indexes(self.engine)
+
+        # Settings live in the settings table (one store, WAL-friendly) and
+        # are mirrored in this dict — reads are a lookup, writes go through
+        # set_setting. Replaces the old settings.json round-trips.
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        stored = self.get_settings(list(self.settings))
+        self.settings.update(
+            {key: self._decode_setting(raw) for key, raw in stored.items()}
+        )
+
+        # Short-TTL read cache: the dashboard polls the same accessors far
+        # more often than the scanner writes, so most reads can be served
+        # from memory. Any write clears it.
+        self._read_cache: Dict[tuple, tuple] = {}
+        self._read_cache_ttl = 5.0
 
     def get_session(self) -> Session:
         return self.Session()
 
+    def reset_pool_after_fork(self):
+        """Drop connections inherited across fork() without closing file
+        descriptors the parent still owns — the documented
+        dispose(close=False) pattern. Sharing pooled SQLite connections
+        between parent and child risks locking/corruption."""
+        self.Session.remove()
+        self.engine.dispose(close=False)
+
+    def remove_session(self):
+        """Return this thread's scoped session to the pool (call at the end
+        of a request/cycle on long-lived worker threads)."""
+        self.Session.remove()
+
+    @contextmanager
+    def _session_scope(self, session: Optional[Session] = None):
+        """Run in the caller's session when one is passed — lets several
+        helpers share a single transaction — else open/close our own."""
+        if session is not None:
+            yield session
+        else:
+            with self.get_session() as own:
+                yield own
+
+    def _cached_read(self, key: tuple, fetch):
+        now = time.monotonic()
+        hit = self._read_cache.get(key)
+        if hit is not None and now - hit[0] < self._read_cache_ttl:
+            return hit[1]
+        value = fetch()
+        self._read_cache[key] = (now, value)
+        return value
+
+    def _invalidate_read_cache(self):
+        self._read_cache.clear()
+
+    def add_signals(self, signal_rows: List[Dict], session: Optional[Session] = None):
+        """Insert many signals in one transaction via the executemany fast
+        path — one commit/fsync for the whole scan instead of one per row."""
+        if not signal_rows:
+            return
+        rows = [
+            {**row, "indicators": serialize_datetimes(row.get("indicators", {}))}
+            for row in signal_rows
+        ]
+        with self._session_scope(session) as s:
+            s.execute(insert(Signal), rows)
+            s.commit()
+        self._invalidate_read_cache()
+
     def add_signal(self, signal_data: Dict):
-        signal_data["indicators"] = serialize_datetimes(signal_data.get("indicators", {}))
-        with self.get_session() as session:
-            signal = Signal(**signal_data)
-            session.add(signal)
-            session.commit()
+        self.add_signals([signal_data])
 
     def get_last_signal(self, symbol: Optional[str] = None) -> Optional[Signal]:
         with self.get_session() as session:
@@ -168,59 +365,207 @@ class DatabaseManager:
             return query.first()
 
     def get_signals(self, symbol: Optional[str] = None, limit: int = 50) -> List[Signal]:
-        with self.get_session() as session:
-            query = session.query(Signal).order_by(Signal.created_at.desc())
+        def fetch():
+            with self.get_session() as session:
+                return session.execute(_signals_select(symbol, limit)).scalars().all()
+        return self._cached_read(("signals", symbol, limit), fetch)
+
+    def get_signals_dicts(self, symbol: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Read-only signal rows as dicts (same shape as Signal.to_dict) via
+        a Core select — skips ORM instrumentation and the identity map for
+        endpoints that immediately serialize."""
+        def fetch():
+            stmt = select(
+                Signal.symbol, Signal.interval, Signal.signal_type, Signal.score,
+                Signal.strategy, Signal.side, Signal.sl, Signal.tp, Signal.entry,
+                Signal.leverage, Signal.margin_usdt, Signal.market,
+                Signal.created_at, Signal.indicators,
+            ).order_by(Signal.created_at.desc()).limit(limit)
             if symbol:
-                query = query.filter(Signal.symbol == symbol)
-            return query.limit(limit).all()
+                stmt = stmt.where(Signal.symbol == symbol)
+            with self.get_session() as session:
+                rows = session.execute(stmt).mappings().all()
+            out = []
+            for row in rows:
+                d = dict(row)
+                d["margin"] = d.pop("margin_usdt")
+                created = d["created_at"]
+                d["created_at"] = created.strftime("%Y-%m-%d %H:%M:%S") if created else None
+                out.append(d)
+            return out
+        return self._cached_read(("signals_dicts", symbol, limit), fetch)
+
+    def get_trades_dicts(self, symbol: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Read-only trade rows as dicts (same shape as Trade.to_dict)."""
+        def fetch():
+            stmt = select(
+                Trade.symbol, Trade.side, Trade.qty, Trade.entry_price,
+                Trade.exit_price, Trade.stop_loss, Trade.take_profit,
+                Trade.leverage, Trade.margin_usdt, Trade.pnl, Trade.timestamp,
+                Trade.status, Trade.order_id, Trade.virtual,
+            ).order_by(Trade.timestamp.desc()).limit(limit)
+            if symbol:
+                stmt = stmt.where(Trade.symbol == symbol)
+            with self.get_session() as session:
+                rows = session.execute(stmt).mappings().all()
+            out = []
+            for row in rows:
+                d = dict(row)
+                d["margin"] = d.pop("margin_usdt")
+                ts = d["timestamp"]
+                d["timestamp"] = ts.strftime("%Y-%m-%d %H:%M:%S") if ts else None
+                out.append(d)
+            return out
+        return self._cached_read(("trades_dicts", symbol, limit), fetch)
+
+    def get_signals_df(self, symbol: Optional[str] = None, limit: int = 500):
+        """Signals as a pandas DataFrame for chart/aggregation callers —
+        columnar arrays instead of a Python object per row, so downstream
+        sort/filter/plot work is vectorized. Cached like the other reads.
+        Legacy callers can use .to_dict('records')."""
+        def fetch():
+            import pandas as pd  # deferred: headless workers never chart
+            stmt = select(
+                Signal.symbol, Signal.interval, Signal.signal_type, Signal.score,
+                Signal.strategy, Signal.side, Signal.sl, Signal.tp, Signal.entry,
+                Signal.leverage, Signal.margin_usdt, Signal.market, Signal.created_at,
+            ).order_by(Signal.created_at.desc()).limit(limit)
+            if symbol:
+                stmt = stmt.where(Signal.symbol == symbol)
+            with self.engine.connect() as conn:
+                return pd.read_sql(stmt, conn)
+        return self._cached_read(("signals_df", symbol, limit), fetch)
+
+    def get_trades_df(self, symbol: Optional[str] = None, limit: int = 500):
+        """Trades as a pandas DataFrame — see get_signals_df."""
+        def fetch():
+            import pandas as pd
+            stmt = select(
+                Trade.symbol, Trade.side, Trade.qty, Trade.entry_price,
+                Trade.exit_price, Trade.stop_loss, Trade.take_profit,
+                Trade.leverage, Trade.margin_usdt, Trade.pnl, Trade.timestamp,
+                Trade.status, Trade.order_id, Trade.virtual,
+            ).order_by(Trade.timestamp.desc()).limit(limit)
+            if symbol:
+                stmt = stmt.where(Trade.symbol == symbol)
+            with self.engine.connect() as conn:
+                return pd.read_sql(stmt, conn)
+        return self._cached_read(("trades_df", symbol, limit), fetch)
+
+    def add_trades(self, trade_rows: List[Dict], session: Optional[Session] = None):
+        if not trade_rows:
+            return
+        with self._session_scope(session) as s:
+            s.execute(insert(Trade), trade_rows)
+            s.commit()
+        self._invalidate_read_cache()
 
     def add_trade(self, trade_data: Dict):
-        with self.get_session() as session:
-            trade = Trade(**trade_data)
-            session.add(trade)
-            session.commit()
+        self.add_trades([trade_data])
 
     def get_trades(self, symbol: Optional[str] = None, limit: int = 50) -> List[Trade]:
-        with self.get_session() as session:
-            query = session.query(Trade).order_by(Trade.timestamp.desc())
-            if symbol:
-                query = query.filter(Trade.symbol == symbol)
-            return query.limit(limit).all()
+        def fetch():
+            with self.get_session() as session:
+                return session.execute(_trades_select(symbol, limit)).scalars().all()
+        return self._cached_read(("trades", symbol, limit), fetch)
 
     def get_recent_trades(self, symbol: Optional[str] = None, limit: int = 50) -> List[Trade]:
         return self.get_trades(symbol=symbol, limit=limit)
 
+    def get_trades_since(self, since: Optional[datetime] = None,
+                         limit: Optional[int] = None) -> List[Trade]:
+        """Return trades ordered by timestamp ascending, filtered in SQL.
+
+        With limit, only the most recent `limit` rows of the window ship
+        (still returned ascending) — callers wanting a rolling window must
+        not pull the whole table as history grows."""
+        with self.get_session() as session:
+            query = session.query(Trade)
+            if since:
+                query = query.filter(Trade.timestamp >= since)
+            if limit is not None:
+                rows = query.order_by(Trade.timestamp.desc()).limit(limit).all()
+                rows.reverse()
+                return rows
+            return query.order_by(Trade.timestamp).all()
+
+    def count_trades_since(self, since: datetime) -> int:
+        with self.get_session() as session:
+            return session.query(Trade).filter(Trade.timestamp >= since).count()
+
     def get_open_trades(self) -> List[Trade]:
         with self.get_session() as session:
-            return session.query(Trade).filter(Trade.status == 'open').all()
+            return session.execute(
+                lambda_stmt(lambda: select(Trade).where(Trade.status == 'open'))
+            ).scalars().all()
+
+    def iter_open_trades(self, batch_size: int = 500):
+        """Stream open trades in server-side batches instead of
+        materializing them all — memory stays bounded on a large book and
+        consumers that early-exit never pull the tail."""
+        with self.get_session() as session:
+            result = session.execute(
+                select(Trade)
+                .where(Trade.status == 'open')
+                .execution_options(stream_results=True, yield_per=batch_size)
+            ).scalars()
+            yield from result
+
+    def _dialect_insert(self, model):
+        """INSERT ... ON CONFLICT statement for the active dialect — SQLite
+        and Postgres share the on_conflict_do_update API."""
+        if self.engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        return dialect_insert(model)
 
     def close_trade(self, order_id: str, exit_price: float, pnl: float):
+        # One UPDATE ... RETURNING instead of SELECT-then-mutate — RETURNING
+        # hands back the columns the daily-stats bump needs for free
         with self.get_session() as session:
-            trade = session.query(Trade).filter_by(order_id=order_id).first()
-            if trade:
-                trade.exit_price = exit_price
-                trade.pnl = pnl
-                trade.status = 'closed'
-                session.commit()
+            row = session.execute(
+                update(Trade)
+                .where(Trade.order_id == order_id)
+                .values(exit_price=exit_price, pnl=pnl, status='closed')
+                .returning(Trade.entry_price, Trade.qty)
+            ).first()
+            if row is not None:
+                self._bump_daily_stats(session, pnl, row.entry_price * row.qty)
+            session.commit()
+        if row is not None:
+            self._invalidate_read_cache()
+
+    def _bump_daily_stats(self, session: Session, pnl: float, entry_value: float):
+        """Fold a closed trade into today's running aggregates (same
+        transaction as the close itself)."""
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        stmt = self._dialect_insert(DailyStats).values(
+            date=today, sum_pnl=pnl, sum_entry_value=entry_value
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyStats.date],
+            set_={
+                "sum_pnl": DailyStats.sum_pnl + pnl,
+                "sum_entry_value": DailyStats.sum_entry_value + entry_value,
+            },
+        )
+        session.execute(stmt)
 
     def update_portfolio_balance(self, symbol: str, qty: float, avg_price: float, value: float):
+        # Single-statement upsert: one round-trip instead of SELECT-then-
+        # INSERT/UPDATE, and no read-modify-write race between writers
+        stmt = self._dialect_insert(Portfolio).values(
+            symbol=symbol, qty=qty, avg_price=avg_price, value=value
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Portfolio.symbol],
+            set_={"qty": qty, "avg_price": avg_price, "value": value, "updated_at": func.now()},
+        )
         with self.get_session() as session:
-            portfolio = session.query(Portfolio).filter_by(symbol=symbol).first()
-            if portfolio:
-                portfolio.qty = qty
-                portfolio.avg_price = avg_price
-                portfolio.value = value
-                portfolio.updated_at = datetime.now(timezone.utc)
-            else:
-                portfolio = Portfolio(
-                    symbol=symbol,
-                    qty=qty,
-                    avg_price=avg_price,
-                    value=value,
-                    updated_at=datetime.now(timezone.utc)
-                )
-                session.add(portfolio)
+            session.execute(stmt)
             session.commit()
+        self._invalidate_read_cache()
 
     def get_portfolio(self, symbol: Optional[str] = None) -> List[Portfolio]:
         with self.get_session() as session:
@@ -229,13 +574,12 @@ class DatabaseManager:
             return session.query(Portfolio).all()
 
     def set_setting(self, key: str, value: str):
+        stmt = self._dialect_insert(SystemSetting).values(key=key, value=value)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SystemSetting.key], set_={"value": value}
+        )
         with self.get_session() as session:
-            setting = session.query(SystemSetting).filter_by(key=key).first()
-            if setting:
-                setting.value = value
-            else:
-                setting = SystemSetting(key=key, value=value)
-                session.add(setting)
+            session.execute(stmt)
             session.commit()
 
     def get_setting(self, key: str) -> Optional[str]:
@@ -243,86 +587,109 @@ class DatabaseManager:
             setting = session.query(SystemSetting).filter_by(key=key).first()
             return setting.value if setting else None
 
+    def get_settings(self, keys: List[str]) -> Dict[str, str]:
+        """Fetch several settings in one query instead of one round-trip each."""
+        with self.get_session() as session:
+            rows = session.query(SystemSetting).filter(SystemSetting.key.in_(keys)).all()
+            return {s.key: s.value for s in rows}
+
+    def set_settings(self, values: Dict[str, str]):
+        """Upsert several settings in a single statement/commit."""
+        if not values:
+            return
+        stmt = self._dialect_insert(SystemSetting)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SystemSetting.key], set_={"value": stmt.excluded.value}
+        )
+        with self.get_session() as session:
+            session.execute(stmt, [{"key": k, "value": v} for k, v in values.items()])
+            session.commit()
+
     def get_all_settings(self) -> Dict[str, str]:
         with self.get_session() as session:
             settings = session.query(SystemSetting).all()
             return {s.key: s.value for s in settings}
 
     def get_automation_stats(self) -> Dict[str, str]:
+        # Both COUNTs as scalar subqueries of one SELECT — a single
+        # round-trip per dashboard poll instead of one per stat
+        with self.get_session() as session:
+            total_signals, open_trades = session.execute(
+                select(
+                    select(func.count()).select_from(Signal)
+                    .scalar_subquery().label("total_signals"),
+                    select(func.count()).select_from(Trade)
+                    .where(Trade.status == 'open')
+                    .scalar_subquery().label("open_trades"),
+                )
+            ).one()
         return {
-            "total_signals": str(len(self.get_signals())),
-            "open_trades": str(len(self.get_open_trades())),
+            "total_signals": str(total_signals),
+            "open_trades": str(open_trades),
             "timestamp": str(datetime.now())
         }
 
     def get_daily_pnl_pct(self) -> float:
-        with self.get_session() as session:
-            today = date.today()
-            trades = session.query(Trade).filter(
-                Trade.status == 'closed',
-                Trade.timestamp >= datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
-            ).all()
-
-            total_pnl = sum(t.pnl for t in trades if t.pnl is not None)
-            total_entry = sum(t.entry_price * t.qty for t in trades if t.entry_price and t.qty)
-
-            if total_entry == 0:
+        def fetch():
+            # One-row fetch of the running aggregates close_trade maintains —
+            # constant time regardless of how many trades closed today
+            today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            with self.get_session() as session:
+                row = session.execute(
+                    select(DailyStats.sum_pnl, DailyStats.sum_entry_value)
+                    .where(DailyStats.date == today)
+                ).one_or_none()
+
+            if row is None or not row.sum_entry_value:
                 return 0.0
 
-            return round((total_pnl / total_entry) * 100, 2)
-
-    def _settings_file(self):
-        return "settings.json"
-
-    def _load_settings_from_file(self):
-        if os.path.exists(self._settings_file()):
-            try:
-                with open(self._settings_file(), "r") as f:
-                    file_settings = json.load(f)
-                    self.settings.update(file_settings)
-                    print("[DB] ✅ Loaded settings from settings.json")
-            except Exception as e:
-                print(f"[DB] ⚠️ Failed to load settings: {e}")
-        else:
-            self._save_settings_to_file()
+            return round((row.sum_pnl / row.sum_entry_value) * 100, 2)
+        return self._cached_read(("daily_pnl_pct",), fetch)
 
-    def _save_settings_to_file(self):
+    @staticmethod
+    def _decode_setting(raw: str):
+        """Settings are stored as strings; recover numbers transparently."""
         try:
-            with open(self._settings_file(), "w") as f:
-                json.dump(self.settings, f, indent=4)
-                print("[DB] 💾 Settings saved to file")
-        except Exception as e:
-            print(f"[DB] ❌ Failed to save settings: {e}")
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return raw
 
     def update_setting(self, key, value):
         self.settings[key] = value
-        self._save_settings_to_file()
+        self.set_setting(key, str(value))
         print(f"[DB] ⚙️ Updated setting {key} → {value}")
 
+    def update_settings(self, values: Dict):
+        """Apply several settings with one upsert statement/commit."""
+        if not values:
+            return
+        self.settings.update(values)
+        self.set_settings({key: str(value) for key, value in values.items()})
+
     def reset_all_settings_to_defaults(self):
-        self.settings = {
-            "SCAN_INTERVAL": 3600,
-            "TOP_N_SIGNALS": 5,
-            "MAX_LOSS_PCT": -15.0,
-            "TP_PERCENT": 0.30,
-            "SL_PERCENT": 0.15,
-            "LEVERAGE": 20,
-            "RISK_PER_TRADE": 0.01,
-        }
-        self._save_settings_to_file()
+        self.settings = dict(self.DEFAULT_SETTINGS)
+        self.set_settings({key: str(value) for key, value in self.settings.items()})
         print("[DB] 🔄 Settings reset to default values")
 
+    def _count(self, model) -> int:
+        def fetch():
+            with self.get_session() as session:
+                return session.execute(
+                    lambda_stmt(
+                        lambda: select(func.count()).select_from(model),
+                        track_on=(model,),
+                    )
+                ).scalar()
+        return self._cached_read(("count", model.__tablename__), fetch)
+
     def get_signals_count(self) -> int:
-        with self.get_session() as session:
-            return session.query(Signal).count()
+        return self._count(Signal)
 
     def get_trades_count(self) -> int:
-        with self.get_session() as session:
-            return session.query(Trade).count()
+        return self._count(Trade)
 
     def get_portfolio_count(self) -> int:
-        with self.get_session() as session:
-            return session.query(Portfolio).count()
+        return self._count(Portfolio)
 
     def get_db_health(self) -> dict:
         try:
@@ -334,20 +701,7 @@ class DatabaseManager:
         
     def update_automation_stats(self, stats_dict: dict):
         """Update automation stats in DB under the 'AUTOMATION_STATS' key."""
-        session: Session = self.Session()
-        try:
-            setting = session.query(SystemSetting).filter_by(key="AUTOMATION_STATS").first()
-            if setting:
-                setting.value = json.dumps(stats_dict)
-            else:
-                setting = SystemSetting(key="AUTOMATION_STATS", value=json.dumps(stats_dict))
-                session.add(setting)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        self.set_setting("AUTOMATION_STATS", orjson.dumps(stats_dict).decode())
 
 
 # === Global Instance ===
@@ -1,20 +1,75 @@
 import os
 import json
 import numpy as np
+import orjson
 import pandas as pd
 import joblib
-from glob import glob
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from xgboost import XGBClassifier
 from sklearn.model_selection import train_test_split
 
 # === Configuration Paths ===
 MODEL_PATH = "ml_models/profit_xgb_model.pkl"
-TRADE_PATH = "trades/trades.json"
+TRADE_PATH = "trades/trades.jsonl"
+_LEGACY_TRADE_PATH = "trades/trades.json"
 SIGNAL_PATH = "signals/"
 
+
+def _migrate_legacy_trades():
+    """One-shot conversion of the old whole-file JSON array to JSONL."""
+    if os.path.exists(TRADE_PATH) or not os.path.exists(_LEGACY_TRADE_PATH):
+        return
+    try:
+        with open(_LEGACY_TRADE_PATH, "r", encoding="utf-8") as f:
+            trades = json.load(f)
+        if isinstance(trades, list):
+            with open(TRADE_PATH, "w", encoding="utf-8") as f:
+                for trade in trades:
+                    f.write(json.dumps(trade, separators=(",", ":")) + "\n")
+            os.rename(_LEGACY_TRADE_PATH, _LEGACY_TRADE_PATH + ".bak")
+            print(f"[ML] ✅ Migrated {len(trades)} trades to JSONL.")
+    except Exception as e:
+        print(f"[ML] ⚠️ Failed to migrate {_LEGACY_TRADE_PATH}: {e}")
+
+def _load_virtual_trade(path):
+    """Parse one saved signal file into a pseudo-trade, or None."""
+    try:
+        with open(path, "rb") as f:
+            signal = orjson.loads(f.read())
+
+        trade = {
+            "symbol": signal.get("symbol"),
+            "entry": signal.get("entry"),
+            "tp": signal.get("tp"),
+            "sl": signal.get("sl"),
+            "trail": signal.get("trail", 0),
+            "score": signal.get("score"),
+            "confidence": signal.get("confidence"),
+            "side": signal.get("side"),
+            "trend": signal.get("trend"),
+            "regime": signal.get("regime", "Breakout"),
+            "profit": 1 if signal.get("score", 0) > 70 else 0
+        }
+
+        if all(trade[k] is not None for k in ["entry", "tp", "sl", "score", "confidence", "side", "trend"]):
+            return trade
+
+    except Exception as e:
+        print(f"[ML] ⚠️ Failed to load signal {path}: {e}")
+    return None
+
+
 class MLFilter:
+    # LRU bound for the forward-pass memo below
+    SCORE_CACHE_MAX = 4096
+
     def __init__(self):
         self.model = self._load_model()
+        # Memoizes predict_proba by feature vector: in quiet markets the
+        # same OHLCV-derived features repeat across cycles, so most calls
+        # become a dict hit instead of an XGBoost forward pass
+        self._score_cache: OrderedDict = OrderedDict()
 
     def _load_model(self):
         if os.path.exists(MODEL_PATH):
@@ -38,11 +93,24 @@ class MLFilter:
             1 if signal.get("regime") == "Breakout" else 0,
         ])
 
+    def _score_features(self, features_key: tuple) -> float:
+        cached = self._score_cache.get(features_key)
+        if cached is not None:
+            self._score_cache.move_to_end(features_key)
+            return cached
+        features = np.array(features_key).reshape(1, -1)
+        prob = float(self.model.predict_proba(features)[0][1])
+        if len(self._score_cache) >= self.SCORE_CACHE_MAX:
+            self._score_cache.popitem(last=False)
+        self._score_cache[features_key] = prob
+        return prob
+
     def enhance_signal(self, signal: dict) -> dict:
         """Add score/confidence to signal using model (if available)."""
         if self.model:
-            features = self.extract_features(signal).reshape(1, -1)
-            prob = self.model.predict_proba(features)[0][1]
+            # dicts aren't hashable — key the memo on the feature tuple;
+            # only the model score is cached, confidence jitter stays per-call
+            prob = self._score_features(tuple(self.extract_features(signal)))
             signal["score"] = round(prob * 100, 2)
             signal["confidence"] = int(min(signal["score"] + np.random.uniform(0, 10), 100))
         else:
@@ -51,57 +119,68 @@ class MLFilter:
             signal["confidence"] = signal.get("confidence", 70)
         return signal
 
-    def append_live_trade(self, trade: dict):
-        """Save a real trade to the training set."""
-        os.makedirs(os.path.dirname(TRADE_PATH), exist_ok=True)
-        if not os.path.exists(TRADE_PATH):
-            with open(TRADE_PATH, "w") as f:
-                json.dump([], f)
+    def enhance_signals(self, signals: list) -> list:
+        """Score a whole scan in one predict_proba call.
+
+        Per-signal calls pay XGBoost's fixed dispatch overhead on a (1, 9)
+        matrix N times; stacking the uncached feature rows into one (M, 9)
+        batch pays it once, and the memo still short-circuits repeats."""
+        if not signals:
+            return signals
+        if not self.model:
+            for signal in signals:
+                signal["score"] = signal.get("score", 60)
+                signal["confidence"] = signal.get("confidence", 70)
+            return signals
+
+        keys = [tuple(self.extract_features(s)) for s in signals]
+        missing = [k for k in dict.fromkeys(keys) if k not in self._score_cache]
+        if missing:
+            probs = self.model.predict_proba(np.array(missing))[:, 1]
+            for key, prob in zip(missing, probs):
+                if len(self._score_cache) >= self.SCORE_CACHE_MAX:
+                    self._score_cache.popitem(last=False)
+                self._score_cache[key] = float(prob)
+
+        jitter = np.random.uniform(0, 10, size=len(signals))
+        for signal, key, j in zip(signals, keys, jitter):
+            prob = self._score_cache[key]
+            self._score_cache.move_to_end(key)
+            signal["score"] = round(prob * 100, 2)
+            signal["confidence"] = int(min(signal["score"] + j, 100))
+        return signals
 
-        with open(TRADE_PATH, "r+", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    data = []
-            except Exception:
-                data = []
+    def append_live_trade(self, trade: dict):
+        """Save a real trade to the training set.
 
-            data.append(trade)
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+        JSONL makes this an O(1) append; the old array file was re-parsed
+        and fully rewritten for every single trade."""
+        os.makedirs(os.path.dirname(TRADE_PATH), exist_ok=True)
+        _migrate_legacy_trades()
+        with open(TRADE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(trade, separators=(",", ":")) + "\n")
 
         print(f"[ML] ✅ New trade appended for training.")
 
     def load_signals_as_virtual_trades(self) -> list:
-        """Turn saved signals into pseudo-trades with assumed profit."""
-        virtual_trades = []
-        signal_files = glob(os.path.join(SIGNAL_PATH, "*.json"))
+        """Turn saved signals into pseudo-trades with assumed profit.
+
+        The files are independent reads, so a thread pool overlaps the
+        open/read syscalls and orjson does the decoding; scandir lists the
+        directory without the per-file stat that glob pays."""
+        try:
+            paths = [
+                e.path for e in os.scandir(SIGNAL_PATH) if e.name.endswith(".json")
+            ]
+        except FileNotFoundError:
+            paths = []
 
-        for path in signal_files:
-            try:
-                with open(path, "r") as f:
-                    signal = json.load(f)
-
-                trade = {
-                    "symbol": signal.get("symbol"),
-                    "entry": signal.get("entry"),
-                    "tp": signal.get("tp"),
-                    "sl": signal.get("sl"),
-                    "trail": signal.get("trail", 0),
-                    "score": signal.get("score"),
-                    "confidence": signal.get("confidence"),
-                    "side": signal.get("side"),
-                    "trend": signal.get("trend"),
-                    "regime": signal.get("regime", "Breakout"),
-                    "profit": 1 if signal.get("score", 0) > 70 else 0
-                }
-
-                if all(k in trade and trade[k] is not None for k in ["entry", "tp", "sl", "score", "confidence", "side", "trend"]):
-                    virtual_trades.append(trade)
-
-            except Exception as e:
-                print(f"[ML] ⚠️ Failed to load signal {path}: {e}")
+        virtual_trades = []
+        if paths:
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                virtual_trades = [
+                    t for t in ex.map(_load_virtual_trade, paths) if t is not None
+                ]
 
         print(f"[ML] ✅ Loaded {len(virtual_trades)} virtual trades from signals.")
         return virtual_trades
@@ -111,15 +190,15 @@ class MLFilter:
         all_trades = []
 
         # Load real trades
+        _migrate_legacy_trades()
         if os.path.exists(TRADE_PATH):
             try:
-                with open(TRADE_PATH, "r") as f:
-                    real_trades = json.load(f)
-                    if isinstance(real_trades, list):
-                        all_trades.extend(real_trades)
-                        print(f"[ML] ✅ Loaded {len(real_trades)} real trades.")
+                with open(TRADE_PATH, "r", encoding="utf-8") as f:
+                    real_trades = [json.loads(line) for line in f if line.strip()]
+                all_trades.extend(real_trades)
+                print(f"[ML] ✅ Loaded {len(real_trades)} real trades.")
             except Exception as e:
-                print(f"[ML] ⚠️ Failed to load trades.json: {e}")
+                print(f"[ML] ⚠️ Failed to load {TRADE_PATH}: {e}")
 
         # Load synthetic trades from signals
         all_trades.extend(self.load_signals_as_virtual_trades())
@@ -1,10 +1,26 @@
 from fpdf import FPDF
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timedelta, timezone
-from time import sleep
+from time import sleep, monotonic
+import os
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pytz
 import sys
 
+# One keep-alive session shared by every fetch in this module — the scan
+# workers reuse pooled TCP+TLS connections to api.bybit.com instead of
+# paying a fresh handshake per kline request
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+))
+
 # === CONFIGURATION ===
 RISK_PCT = 0.015
 ACCOUNT_BALANCE = 100
@@ -15,6 +31,9 @@ MIN_ATR_PCT = 0.001
 RSI_ZONE = (20, 80)
 INTERVALS = ['15', '60', '240']
 MAX_SYMBOLS = 100
+# analyze() is three blocking kline fetches per symbol — pure I/O wait, so
+# scanning threads overlap round-trips instead of paying them in sequence
+SCAN_WORKERS = int(os.getenv('SCAN_WORKERS', 16))
 
 tz_utc3 = timezone(timedelta(hours=3))
 
@@ -61,50 +80,76 @@ def format_signal_block(s):
     )
 
 # === INDICATORS ===
+# All kernels take float64 ndarrays; the per-element Python loops became
+# C-level array ops, which is what makes a 100-symbol × 3-timeframe scan
+# indicator cost negligible next to the HTTP fetches.
+# Klines only move when a bar closes, so a short per-(symbol, interval)
+# cache absorbs scans that re-run faster than the bar period; it holds at
+# most MAX_SYMBOLS × len(INTERVALS) entries
+CANDLES_TTL = 60
+_candles_cache = {}
+
 def get_candles(sym, interval):
+    key = (sym, interval)
+    hit = _candles_cache.get(key)
+    if hit is not None and monotonic() - hit[0] < CANDLES_TTL:
+        return hit[1]
     url = f"https://api.bybit.com/v5/market/kline?category=linear&symbol={sym}&interval={interval}&limit=200"
     try:
-        data = requests.get(url).json()
-        return [ {
-            'high': float(c[2]), 'low': float(c[3]), 'close': float(c[4]), 'volume': float(c[5])
-        } for c in reversed(data['result']['list']) ]
+        data = SESSION.get(url).json()
+        # columns 2..5 are high/low/close/volume; API returns newest-first
+        rows = np.array(
+            [c[2:6] for c in data['result']['list']], dtype=np.float64
+        )[::-1]
+        candles = {
+            'high': rows[:, 0], 'low': rows[:, 1],
+            'close': rows[:, 2], 'volume': rows[:, 3],
+        }
+        _candles_cache[key] = (monotonic(), candles)
+        return candles
     except:
-        return []
+        # A stale bar beats no bar on a transient fetch error
+        return hit[1] if hit is not None else None
+
+def _decayed_tail(seed, tail, alpha):
+    """Closed form of val = (1-a)*val + a*p over `tail`, seeded with `seed` —
+    the smoothing recursions (EMA, Wilder ATR) as one dot product."""
+    if tail.size == 0:
+        return float(seed)
+    decay = np.power(1.0 - alpha, np.arange(tail.size - 1, -1, -1, dtype=np.float64))
+    return float(seed * (1.0 - alpha) ** tail.size + alpha * np.dot(decay, tail))
 
 def ema(prices, period):
-    if len(prices) < period: return None
-    mult = 2 / (period + 1)
-    val = sum(prices[:period]) / period
-    for p in prices[period:]:
-        val = (p - val) * mult + val
-    return val
+    if prices.size < period: return None
+    return _decayed_tail(prices[:period].mean(), prices[period:], 2.0 / (period + 1))
 
 def sma(prices, period):
-    if len(prices) < period: return None
-    return sum(prices[-period:]) / period
+    if prices.size < period: return None
+    return float(prices[-period:].mean())
 
 def rsi(prices, period=14):
-    if len(prices) < period + 1: return None
-    gains = [max(prices[i] - prices[i - 1], 0) for i in range(1, period + 1)]
-    losses = [max(prices[i - 1] - prices[i], 0) for i in range(1, period + 1)]
-    ag, al = sum(gains) / period, sum(losses) / period
+    if prices.size < period + 1: return None
+    deltas = np.diff(prices[:period + 1])
+    ag = np.clip(deltas, 0, None).sum() / period
+    al = np.clip(-deltas, 0, None).sum() / period
     rs = ag / (al + 1e-10)
-    return 100 - (100 / (1 + rs))
+    return float(100 - (100 / (1 + rs)))
 
 def bollinger(prices, period=20, sd=2):
-    mid = sma(prices, period)
-    if mid is None: return None, None, None
-    var = sum((p - mid) ** 2 for p in prices[-period:]) / period
-    std = var ** 0.5
+    if prices.size < period: return None, None, None
+    window = prices[-period:]
+    mid = float(window.mean())
+    std = float(window.std())
     return mid + sd * std, mid, mid - sd * std
 
 def atr(highs, lows, closes, period=14):
-    if len(highs) < period + 1: return None
-    trs = [max(h - l, abs(h - c), abs(l - c)) for h, l, c in zip(highs[1:], lows[1:], closes[:-1])]
-    val = sum(trs[:period]) / period
-    for t in trs[period:]:
-        val = (val * (period - 1) + t) / period
-    return val
+    if highs.size < period + 1: return None
+    trs = np.maximum.reduce([
+        highs[1:] - lows[1:],
+        np.abs(highs[1:] - closes[:-1]),
+        np.abs(lows[1:] - closes[:-1]),
+    ])
+    return _decayed_tail(trs[:period].mean(), trs[period:], 1.0 / period)
 
 def macd(prices):
     fast = ema(prices, 12)
@@ -119,25 +164,28 @@ def classify_trend(e9, e21, s20):
 # === SIGNAL ANALYSIS ===
 def analyze(symbol):
     data = {}
+    # The three timeframes are independent fetches — overlap them so a
+    # symbol costs one round-trip of latency instead of three
+    with ThreadPoolExecutor(max_workers=len(INTERVALS)) as ex:
+        candles_by_tf = dict(zip(INTERVALS, ex.map(partial(get_candles, symbol), INTERVALS)))
+
     for tf in INTERVALS:
-        candles = get_candles(symbol, tf)
-        if len(candles) < 30: return None
-        closes = [c['close'] for c in candles]
-        highs = [c['high'] for c in candles]
-        lows = [c['low'] for c in candles]
-        vols = [c['volume'] for c in candles]
+        candles = candles_by_tf[tf]
+        if candles is None or candles['close'].size < 30: return None
+        closes = candles['close']
+        bb_up, bb_mid, bb_low = bollinger(closes)
         data[tf] = {
-            'close': closes[-1],
+            'close': float(closes[-1]),
             'ema9': ema(closes, 9),
             'ema21': ema(closes, 21),
             'sma20': sma(closes, 20),
             'rsi': rsi(closes),
             'macd': macd(closes),
-            'bb_up': bollinger(closes)[0],
-            'bb_mid': bollinger(closes)[1],
-            'bb_low': bollinger(closes)[2],
-            'atr': atr(highs, lows, closes),
-            'volume': vols[-1]
+            'bb_up': bb_up,
+            'bb_mid': bb_mid,
+            'bb_low': bb_low,
+            'atr': atr(candles['high'], candles['low'], closes),
+            'volume': float(candles['volume'][-1])
         }
 
     tf60 = data['60']
@@ -198,22 +246,33 @@ def analyze(symbol):
     }
 
 # === SYMBOL FETCH ===
+# The top-turnover symbol list shifts over hours, not minutes — cache it so
+# every scan cycle doesn't re-hit the tickers endpoint for the same answer
+SYMBOLS_TTL = 3600
+_symbols_cache = {'at': 0.0, 'symbols': []}
+
 def get_usdt_symbols():
+    if _symbols_cache['symbols'] and monotonic() - _symbols_cache['at'] < SYMBOLS_TTL:
+        return _symbols_cache['symbols']
     try:
-        data = requests.get("https://api.bybit.com/v5/market/tickers?category=linear").json()
+        data = SESSION.get("https://api.bybit.com/v5/market/tickers?category=linear").json()
         tickers = [i for i in data['result']['list'] if i['symbol'].endswith("USDT")]
         tickers.sort(key=lambda x: float(x['turnover24h']), reverse=True)
-        return [t['symbol'] for t in tickers[:MAX_SYMBOLS]]
+        symbols = [t['symbol'] for t in tickers[:MAX_SYMBOLS]]
+        _symbols_cache['symbols'] = symbols
+        _symbols_cache['at'] = monotonic()
+        return symbols
     except:
-        return []
+        # Serve the stale list rather than an empty scan on a blip
+        return _symbols_cache['symbols']
 
 # === MAIN LOOP ===
 def main():
     while True:
         print("\n🔍 Scanning Bybit USDT Futures for filtered signals...\n")
         symbols = get_usdt_symbols()
-        signals = [analyze(s) for s in symbols]
-        signals = [s for s in signals if s]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+            signals = [s for s in ex.map(analyze, symbols) if s]
 
         if signals:
             signals.sort(key=lambda x: x['Score'], reverse=True)
@@ -7,7 +7,9 @@ Run this script to start automated trading alongside your dashboard
 import time
 import signal
 import sys
-from automated_trader import automated_trader
+from automated_trader import get_automated_trader
+
+automated_trader = get_automated_trader()
 
 
 def signal_handler(sig, frame):
@@ -1,11 +1,43 @@
 from datetime import datetime
 import json
 import os
+import threading
+import orjson
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Tuple, Union, Dict, Any, Optional
 
+# One pooled session for all outbound HTTP here: keepalive skips the TLS
+# handshake on every call after the first, and transient 429/5xx responses
+# retry with backoff at the transport layer
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+
+# Cached copy of capital.json, invalidated by file mtime so a hit is just a
+# stat() + dict lookup instead of open/read/json.loads on every call.
+_capital_cache: Dict[str, Any] = {"mtime": None, "data": None}
+_capital_lock = threading.Lock()
+
+
+def read_capital(path: str = "capital.json") -> Dict[str, Any]:
+    """Return the parsed contents of capital.json, re-reading only when the
+    file has changed on disk. Raises like open()/json.load() on failure so
+    callers keep their existing error handling."""
+    mtime = os.stat(path).st_mtime
+    with _capital_lock:
+        if _capital_cache["data"] is None or _capital_cache["mtime"] != mtime:
+            with open(path, "rb") as f:
+                _capital_cache["data"] = orjson.loads(f.read())
+            _capital_cache["mtime"] = mtime
+        return _capital_cache["data"]
+
 
 def calculate_indicators(data: List[Dict[str, Any]]) -> pd.DataFrame:
     if not data or len(data) < 30:
@@ -123,7 +155,7 @@ def calculate_drawdown(equity_curve: Union[List[float], pd.Series]) -> Tuple[flo
 def get_ticker_snapshot() -> List[Dict[str, Any]]:
     url = "https://api.bybit.com/v5/market/tickers?category=linear"
     try:
-        response = requests.get(url, timeout=10)
+        response = _session.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
         return data.get("result", {}).get("list", [])[:50]
@@ -135,7 +167,7 @@ def get_ticker_snapshot() -> List[Dict[str, Any]]:
 def get_current_price(symbol: str) -> float:
     url = f"https://api.bybit.com/v5/market/tickers?category=linear&symbol={symbol}"
     try:
-        response = requests.get(url, timeout=10)
+        response = _session.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
         price = data.get("result", {}).get("list", [{}])[0].get("lastPrice")
@@ -176,7 +208,7 @@ def save_trade_json(trade: Dict[str, Any], folder: str = "reports/trades") -> No
         print(f"[save_trade_json] Error saving trade: {e}")
 
 
-def send_discord_message(message: str) -> None:
+def send_discord_message(message: str, raise_on_error: bool = False) -> None:
     webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
     if not webhook_url:
         print("⚠️ DISCORD_WEBHOOK_URL is not set.")
@@ -184,14 +216,18 @@ def send_discord_message(message: str) -> None:
 
     payload = {"content": message}
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = _session.post(webhook_url, json=payload, timeout=10)
         response.raise_for_status()
         print("✅ Discord message sent.")
     except Exception as e:
+        # raise_on_error lets queued senders see 429s and retry; direct
+        # callers keep the old log-and-continue behaviour
+        if raise_on_error:
+            raise
         print(f"❌ Failed to send Discord message: {e}")
 
 
-def send_telegram_message(message: str, parse_mode: str = "HTML") -> None:
+def send_telegram_message(message: str, parse_mode: str = "HTML", raise_on_error: bool = False) -> None:
     token = os.getenv("TELEGRAM_BOT_TOKEN")
     chat_id = os.getenv("TELEGRAM_CHAT_ID")
     if not token or not chat_id:
@@ -206,10 +242,12 @@ def send_telegram_message(message: str, parse_mode: str = "HTML") -> None:
     }
 
     try:
-        response = requests.post(url, data=data, timeout=10)
+        response = _session.post(url, data=data, timeout=10)
         response.raise_for_status()
         print("✅ Telegram message sent.")
     except Exception as e:
+        if raise_on_error:
+            raise
         print(f"❌ Failed to send Telegram message: {e}")
 
 def serialize_datetimes(obj):
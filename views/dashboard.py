@@ -1,7 +1,6 @@
 import streamlit as st
 from datetime import datetime, timezone
 
-from db import Signal  # ✅ Correct import for the Signal model
 
 def render(trading_engine, dashboard, db_manager):
     st.title("🚀 AlgoTrader Dashboard")
@@ -10,17 +9,16 @@ def render(trading_engine, dashboard, db_manager):
     daily_pnl_pct = trading_engine.get_daily_pnl()
     recent_trades = trading_engine.get_recent_trades(limit=10)
 
-    # ✅ Use the imported Signal model directly
-    with db_manager.get_session() as session:
-        signal_objs = session.query(Signal).order_by(Signal.created_at.desc()).limit(5).all()
-        recent_signals = [s.to_dict() for s in signal_objs]
+    # Dict rows straight from a Core select — no ORM hydration needed here
+    recent_signals = db_manager.get_signals_dicts(limit=5)
 
     # === KPI Row ===
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Wallet Balance", f"${balance['capital']:.2f}", f"{daily_pnl_pct:.2f}%")
     col2.metric("Active Signals", len(recent_signals), "Last hour")
+    today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     col3.metric("Trades Today", len([
-        t for t in recent_trades if t["timestamp"].startswith(datetime.now(timezone.utc).strftime("%Y-%m-%d"))
+        t for t in recent_trades if t["timestamp"].startswith(today_str)
     ]))
     
     st.markdown("---")
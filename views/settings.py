@@ -46,11 +46,13 @@ def render(trading_engine, dashboard):
                     st.error(f"❌ Telegram error: {e}")
 
     if st.button("💾 Save Settings"):
-        trading_engine.db.update_setting("MAX_LOSS_PCT", new_max_loss)
-        trading_engine.db.update_setting("TP_PERCENT", new_tp)
-        trading_engine.db.update_setting("SL_PERCENT", new_sl)
-        trading_engine.db.update_setting("LEVERAGE", new_lev)
-        trading_engine.db.update_setting("RISK_PER_TRADE", new_risk)
+        trading_engine.db.update_settings({
+            "MAX_LOSS_PCT": new_max_loss,
+            "TP_PERCENT": new_tp,
+            "SL_PERCENT": new_sl,
+            "LEVERAGE": new_lev,
+            "RISK_PER_TRADE": new_risk,
+        })
 
         if discord_url:
             os.environ["DISCORD_WEBHOOK_URL"] = discord_url
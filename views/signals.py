@@ -3,7 +3,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from db import db_manager, Signal
+from db import db_manager
 
 
 def render(trading_engine, dashboard, db_manager):
@@ -22,23 +22,8 @@ def render(trading_engine, dashboard, db_manager):
                 st.success(f"Generated {len(new_signals)} signals")
                 st.rerun()
 
-    # Load signals from DB
-    with db_manager.get_session() as session:
-        signal_objs = session.query(Signal) \
-                             .order_by(Signal.created_at.desc()) \
-                             .limit(100).all()
-
-    signal_dicts = [s.to_dict() if hasattr(s, 'to_dict') else {
-        "symbol": s.symbol,
-        "side": s.side,
-        "score": s.score,
-        "strategy": s.strategy,
-        "entry": s.entry,
-        "tp": s.tp,
-        "sl": s.sl,
-        "interval": s.interval,
-        "created_at": s.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-    } for s in signal_objs]
+    # Load signals from DB as plain dicts — no ORM hydration
+    signal_dicts = db_manager.get_signals_dicts(limit=100)
 
     if not signal_dicts:
         st.info("No signals available. Scan to generate signals.")